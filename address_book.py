@@ -1,9 +1,11 @@
+import bisect
+import calendar
+import functools
 from collections import UserDict, defaultdict
 from datetime import datetime, timedelta
+from itertools import islice
 import re
-from colorama import init, Fore
-
-init()
+from colorama import Fore
 
 
 class Field:
@@ -15,9 +17,18 @@ class Field:
 
     """
 
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
+    def __getstate__(self):
+        return {'value': self.value}
+
+    def __setstate__(self, state):
+        # pickles made before __slots__ carry the same dict as their __dict__
+        self.value = state['value']
+
     def __str__(self):
         return str(self.value)
 
@@ -31,6 +42,8 @@ class Name(Field):
 
     """
 
+    __slots__ = ()
+
     def __init__(self, value):
         super().__init__(value)
 
@@ -45,8 +58,15 @@ class InvalidEmailException(Exception):
     pass
 
 
+# number of recently validated emails and birthdays remembered by the validators
+VALIDATION_CACHE_SIZE = 4096
+
+EMAIL_PATTERN = re.compile(r'([A-Za-z0-9]+[.-_])*[A-Za-z0-9]+@[A-Za-z0-9-]+(\.[A-Z|a-z]{2,})+')
+
+
 def phone_validator(func):
     def inner(*args, **kwargs):
+        # a length check is cheaper than a cache lookup
         if (len(args[1]) != 10):
             raise InvalidPhoneException
         return func(*args, **kwargs)
@@ -54,11 +74,15 @@ def phone_validator(func):
     return inner
 
 
+@functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def is_valid_email(email):
+    """Перевіряє електронну адресу, запам'ятовуючи результати для нещодавно перевірених адрес."""
+    return EMAIL_PATTERN.fullmatch(email) is not None
+
+
 def email_validator(func):
     def inner(*args, **kwargs):
-        email = args[1]
-        regex = re.compile(r'([A-Za-z0-9]+[.-_])*[A-Za-z0-9]+@[A-Za-z0-9-]+(\.[A-Z|a-z]{2,})+')
-        if not re.fullmatch(regex, email):
+        if not is_valid_email(args[1]):
             raise InvalidEmailException
         return func(*args, **kwargs)
 
@@ -74,6 +98,8 @@ class Phone(Field):
 
     """
 
+    __slots__ = ()
+
     @phone_validator
     def __init__(self, value):
         super().__init__(value)
@@ -88,6 +114,8 @@ class Email(Field):
 
     """
 
+    __slots__ = ()
+
     @email_validator
     def __init__(self, value):
         super().__init__(value)
@@ -102,6 +130,8 @@ class Address(Field):
 
     """
 
+    __slots__ = ()
+
     def __init__(self, value):
         super().__init__(value)
 
@@ -111,15 +141,25 @@ class InvalidBirthDateFormatException(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def parse_birthday(birthday):
+    """
+    Розбирає дату народження, запам'ятовуючи результати для нещодавно розібраних дат.
+
+    Returns:
+        datetime: Дата народження або None, якщо формат дати недійсний.
+    """
+    try:
+        return datetime.strptime(birthday, Birthday.date_format)
+    except ValueError:
+        return None
+
+
 def birthday_validator(func):
     def inner(*args, **kwargs):
         updated_args = list(args)
-        try:
-            updated_args[1] = datetime.strptime(
-                args[1],
-                Birthday.date_format,
-            )
-        except ValueError:
+        updated_args[1] = parse_birthday(args[1])
+        if updated_args[1] is None:
             raise InvalidBirthDateFormatException
         return func(*updated_args, **kwargs)
 
@@ -135,6 +175,8 @@ class Birthday(Field):
 
     """
 
+    __slots__ = ()
+
     date_format = "%d.%m.%Y"
 
     @birthday_validator
@@ -145,6 +187,22 @@ class Birthday(Field):
         return f"{Fore.YELLOW}{self.value.strftime(Birthday.date_format)}"
 
 
+def track_changes(func):
+    """Повідомляє книгу, якій належить запис, про зміну запису."""
+    def inner(*args, **kwargs):
+        record = args[0]
+        book = record._book
+        if book is not None:
+            book._unindex_record(record)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if book is not None:
+                book._index_record(record)
+
+    return inner
+
+
 class Record:
     """
     Клас Record визначає контактну інформацію.
@@ -158,67 +216,99 @@ class Record:
 
     """
 
+    __slots__ = ('name', 'phones', 'birthday', 'emails', 'address', '_book')
+
     def __init__(self, name):
         self.name = Name(name)
         self.phones = []
         self.birthday = None
         self.emails = []
         self.address = None
+        self._book = None
 
+    @track_changes
     def add_phone(self, phone):
         """Додає новий номер телефону до контакту."""
         self.phones.append(Phone(phone))
 
+    @track_changes
     def remove_phone(self, phone):
         """Видаляє вказаний номер телефону з контакту."""
         self.phones = [p for p in self.phones if p.value != phone]
 
+    @track_changes
     def edit_phone(self, old_phone, new_phone):
         """Змінює вказаний номер телефону на новий."""
-        old = Phone(old_phone)
+        new = Phone(new_phone)
         for i, phone in enumerate(self.phones):
-            if (phone.value == old.value):
-                self.phones[i] = Phone(new_phone)
+            if (phone.value == old_phone):
+                self.phones[i] = new
 
     def find_phone(self, phone):
         """Знаходить телефонний номер."""
-        find = Phone(phone)
+        # a stored phone is already valid, so the lookup value needs no validation
         for p in self.phones:
-            if (p.value == find.value):
+            if (p.value == phone):
                 return p
         return None
 
+    @track_changes
     def add_email(self, email):
         """Додає нову електронну адресу до контакту."""
         self.emails.append(Email(email))
 
+    @track_changes
     def remove_email(self, email):
         """Видаляє вказану електронну адресу з контакту."""
         self.emails = [e for e in self.emails if e.value != email]
 
+    @track_changes
     def change_email(self, old_email, new_email):
         """Змінює вказану електронну адресу на нову."""
-        old = Email(old_email)
+        new = Email(new_email)
         for i, email in enumerate(self.emails):
-            if (email.value == old.value):
-                self.emails[i] = Email(new_email)
+            if (email.value == old_email):
+                self.emails[i] = new
 
     def find_email(self, email):
         """Знаходить електронну адресу."""
-        find = Email(email)
+        # a stored email is already valid, so the lookup value needs no validation
         for e in self.emails:
-            if (e.value == find.value):
+            if (e.value == email):
                 return e
         return None
 
+    @track_changes
     def add_birthday(self, birthday):
         """Додає дату народження контакту."""
         self.birthday = Birthday(birthday)
 
+    @track_changes
     def add_address(self, address):
         """Додає адресу контакту."""
         self.address = Address(address)
 
+    def search_text(self):
+        """Повертає всю інформацію контакту одним рядком для пошуку."""
+        # combine all info into one searchable line
+        return ' '.join([
+            self.name.value,
+            ' '.join(e.value for e in self.phones),
+            ' '.join(e.value for e in self.emails),
+            str(self.birthday) if self.birthday is not None else '',
+            self.address.value if self.address is not None else '',
+        ]).lower()
+
+    def __getstate__(self):
+        # the owning book re-attaches itself after unpickling
+        return {slot: getattr(self, slot) for slot in Record.__slots__ if slot != '_book'}
+
+    def __setstate__(self, state):
+        # pickles made before __slots__ carry the same dict as their __dict__
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        self._book = None
+
     def __str__(self):
         res = f"{Fore.YELLOW}Contact name: {self.name.value}; phones: {', '.join(p.value for p in self.phones)}"
         if (self.birthday is not None):
@@ -230,6 +320,180 @@ class Record:
         return res
 
 
+def trigrams(text):
+    """Повертає множину триграм рядка."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ContactIndex:
+    """
+    Клас ContactIndex визначає інвертований індекс токенів книги контактів.
+
+    Атрибути:
+        tokens (dict): Відповідність токена множині імен контактів.
+        trigrams (dict): Відповідність триграми множині токенів, що її містять.
+
+    """
+
+    def __init__(self):
+        self.tokens = defaultdict(set)
+        self.trigrams = defaultdict(set)
+
+    def add(self, name, record):
+        """Додає токени запису до індексу."""
+        for token in set(record.search_text().split()):
+            if token not in self.tokens:
+                for trigram in trigrams(token):
+                    self.trigrams[trigram].add(token)
+            self.tokens[token].add(name)
+
+    def remove(self, name, record):
+        """Видаляє токени запису з індексу."""
+        for token in set(record.search_text().split()):
+            names = self.tokens[token]
+            names.discard(name)
+            if not names:
+                del self.tokens[token]
+                for trigram in trigrams(token):
+                    tokens = self.trigrams[trigram]
+                    tokens.discard(token)
+                    if not tokens:
+                        del self.trigrams[trigram]
+
+    def lookup(self, word):
+        """Повертає імена контактів, токени яких містять слово."""
+        # the word has no whitespace, so it can only occur inside a single token
+        return set().union(*(self.tokens[token] for token in self._matching_tokens(word)))
+
+    def _matching_tokens(self, word):
+        """Повертає токени, що містять слово."""
+        if len(word) < 3:
+            # too short for trigrams, scan the vocabulary instead
+            return [token for token in self.tokens if word in token]
+
+        candidates = sorted((self.trigrams.get(trigram, set()) for trigram in trigrams(word)), key=len)
+        return [token for token in set.intersection(*candidates) if word in token]
+
+
+class BirthdayIndex:
+    """
+    Клас BirthdayIndex визначає календар днів народження книги контактів.
+
+    Атрибути:
+        days (dict): Відповідність пари (місяць, день) множині імен контактів.
+
+    """
+
+    def __init__(self):
+        self.days = defaultdict(set)
+
+    def add(self, name, record):
+        """Додає день народження запису до календаря."""
+        if record.birthday is not None:
+            self.days[(record.birthday.value.month, record.birthday.value.day)].add(name)
+
+    def remove(self, name, record):
+        """Видаляє день народження запису з календаря."""
+        if record.birthday is not None:
+            key = (record.birthday.value.month, record.birthday.value.day)
+            names = self.days[key]
+            names.discard(name)
+            if not names:
+                del self.days[key]
+
+    def lookup(self, month, day):
+        """Повертає імена контактів з днем народження у вказаний день."""
+        return self.days.get((month, day), set())
+
+
+def normalize_phone(phone):
+    """Повертає лише цифри номера телефону."""
+    return ''.join(ch for ch in phone if ch.isdigit())
+
+
+class OwnerIndex:
+    """
+    Клас OwnerIndex визначає індекс власників телефонів та електронних адрес.
+
+    Атрибути:
+        phones (dict): Відповідність нормалізованого телефону множині імен контактів.
+        emails (dict): Відповідність електронної адреси у нижньому регістрі множині імен контактів.
+
+    """
+
+    def __init__(self):
+        self.phones = defaultdict(set)
+        self.emails = defaultdict(set)
+
+    def add(self, name, record):
+        """Додає телефони та електронні адреси запису до індексу."""
+        for key, index in self._keys(record):
+            index[key].add(name)
+
+    def remove(self, name, record):
+        """Видаляє телефони та електронні адреси запису з індексу."""
+        for key, index in self._keys(record):
+            names = index[key]
+            names.discard(name)
+            if not names:
+                del index[key]
+
+    def lookup(self, value):
+        """Повертає імена контактів, яким належить телефон або електронна адреса."""
+        if '@' in value:
+            return self.emails.get(value.lower(), set())
+        return self.phones.get(normalize_phone(value), set())
+
+    def _keys(self, record):
+        """Повертає ключі запису разом зі словником індексу, до якого вони належать."""
+        return [(normalize_phone(phone.value), self.phones) for phone in record.phones] + \
+            [(email.value.lower(), self.emails) for email in record.emails]
+
+
+class SortedNames:
+    """
+    Клас SortedNames визначає відсортований без урахування регістру список імен контактів.
+
+    Атрибути:
+        keys (list): Пари ім'я у нижньому регістрі та ім'я, відсортовані за зростанням.
+
+    """
+
+    def __init__(self, names=()):
+        self.keys = sorted((name.lower(), name) for name in names)
+
+    def add(self, name):
+        """Додає ім'я до списку."""
+        bisect.insort(self.keys, (name.lower(), name))
+
+    def remove(self, name):
+        """Видаляє ім'я зі списку."""
+        i = bisect.bisect_left(self.keys, (name.lower(), name))
+        if i < len(self.keys) and self.keys[i][1] == name:
+            del self.keys[i]
+
+    def range(self, start, stop=None):
+        """Повертає імена, що у нижньому регістрі не менші за start та менші за stop."""
+        i = bisect.bisect_left(self.keys, (start.lower(),))
+        j = len(self.keys) if stop is None else bisect.bisect_left(self.keys, (stop.lower(),))
+        return [name for _, name in self.keys[i:j]]
+
+    def prefix(self, prefix):
+        """Повертає імена, що починаються з prefix без урахування регістру."""
+        prefix = prefix.lower()
+        i = bisect.bisect_left(self.keys, (prefix,))
+        names = []
+        while i < len(self.keys) and self.keys[i][0].startswith(prefix):
+            names.append(self.keys[i][1])
+            i += 1
+        return names
+
+    def slice(self, offset=0, limit=None):
+        """Повертає імена з offset у відсортованому порядку, не більше limit."""
+        stop = None if limit is None else offset + limit
+        return [name for _, name in self.keys[offset:stop]]
+
+
 class AddressBook(UserDict):
     """
     Клас AddressBook визначає книгу контактів.
@@ -238,9 +502,64 @@ class AddressBook(UserDict):
 
     """
 
+    def __init__(self, *args, **kwargs):
+        self._reset_indexes()
+        self._changes = {}
+        self._parallel_search = None
+        self.build_search_index = True
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, name, record):
+        old_record = self.data.get(name)
+        readded = False
+        if old_record is not None:
+            self._unindex_record(old_record)
+            old_record._book = None
+        else:
+            # a name deleted and added again moves to the end of the book and of the changes
+            readded = self._changes.pop(name, None) is not None
+            if self._order is not None:
+                self._order[name] = self._next_position
+                self._next_position += 1
+            if self._sorted_names is not None:
+                self._sorted_names.add(name)
+        self.data[name] = record
+        record._book = self
+        self._index_record(record)
+        if readded:
+            self._changes[name] = True
+
+    def __delitem__(self, name):
+        record = self.data.pop(name)
+        self._unindex_record(record)
+        record._book = None
+        self._changes.pop(name, None)
+        self._changes[name] = False
+        if self._order is not None:
+            del self._order[name]
+        if self._sorted_names is not None:
+            self._sorted_names.remove(name)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # indexes are rebuilt on first use after loading
+        for attribute in ['_contact_index', '_birthday_index', '_owner_index', '_sorted_names', '_order',
+                          '_next_position', '_changes', '_parallel_search', 'build_search_index']:
+            del state[attribute]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset_indexes()
+        self._changes = {}
+        self._parallel_search = None
+        self.build_search_index = True
+        for record in self.data.values():
+            record._book = self
+
     def add_record(self, record):
         """Додає новий запис до книги контактів."""
-        self.data[record.name.value] = record
+        self[record.name.value] = record
 
     def find(self, name):
         """Знаходить запис за іменем."""
@@ -248,32 +567,95 @@ class AddressBook(UserDict):
 
     def delete(self, name):
         """Видаляє запис за іменем."""
-        del self.data[name]
+        del self[name]
+
+    def iter_records(self, offset=0, limit=None, sort=False):
+        """
+        Повертає записи книги по одному, пропускаючи перші offset записів без їх декодування.
+
+        Args:
+            offset (int): Кількість записів, які потрібно пропустити.
+            limit (int): Найбільша кількість записів або None для всіх.
+            sort (bool): Впорядкувати записи за іменем замість порядку додавання.
+        """
+        if sort:
+            names = self._get_sorted_names().slice(offset, limit)
+        else:
+            names = islice(self.data, offset, None if limit is None else offset + limit)
+        for name in names:
+            yield self.data[name]
+
+    def find_by_prefix(self, prefix):
+        """Знаходить контакти, ім'я яких починається з prefix без урахування регістру, за іменем."""
+        return [self.data[name] for name in self._get_sorted_names().prefix(prefix)]
+
+    def find_in_range(self, start, stop=None):
+        """Знаходить контакти з іменами від start (включно) до stop без урахування регістру, за іменем."""
+        return [self.data[name] for name in self._get_sorted_names().range(start, stop)]
+
+    def pop_changes(self):
+        """
+        Повертає зміни з часу попереднього виклику: пари ім'я та запис (None для видалених).
+
+        Зміни йдуть у порядку додавання записів, тож застосовані по черзі вони відтворюють
+        порядок книги. Перед записом, який видалили і додали знову, повертається його видалення.
+        """
+        changes = []
+        for name, readded in self._changes.items():
+            record = self.data.get(name)
+            if readded and record is not None:
+                changes.append((name, None))
+            changes.append((name, record))
+        self._changes.clear()
+        return changes
 
     def search_contacts(self, search_word):
-        """Шукає контакти за вказаним словом."""
+        """
+        Шукає контакти за вказаним словом.
+
+        Якщо build_search_index вимкнено, а індекс контактів ще не побудовано, контакти
+        перебираються: для одного запиту це швидше, ніж будувати індекс.
+        """
         word = search_word.lower()
-        results = []
-        for record in self.values():
-            # combine all info into one searchable line
-            record_info = ' '.join([
-                record.name.value,
-                ' '.join(e.value for e in record.phones),
-                ' '.join(e.value for e in record.emails),
-                str(record.birthday) if record.birthday is not None else '',
-                record.address.value if record.address is not None else '',
-            ]).lower()
-
-            if word in record_info:
-                results.append(record)
-        return results
+        # empty words and words with spaces can span several fields
+        scan = word.split() != [word] or (not self.build_search_index and self._contact_index is None)
+        if scan and self._parallel_search is None:
+            return [record for record in self.data.values() if word in record.search_text()]
+
+        if self._parallel_search is not None:
+            names = self._parallel_search.search(word)
+        else:
+            names = self._get_contact_index().lookup(word)
+        return [self.data[name] for name in self._sort_names(names)]
+
+    def enable_parallel_search(self, processes=None):
+        """
+        Вмикає пошук контактів у кількох процесах, кожен з яких тримає свою частину книги.
+
+        Процеси запускаються при першому пошуку, а індекс контактів цієї книги більше не будується.
+
+        Args:
+            processes (int): Кількість процесів або None для кількості ядер процесора.
+        """
+        from parallel_search import ParallelSearch
+
+        self.disable_parallel_search()
+        self._parallel_search = ParallelSearch(self, processes)
+        self._contact_index = None
+
+    def disable_parallel_search(self):
+        """Зупиняє процеси паралельного пошуку, якщо їх запущено."""
+        if self._parallel_search is not None:
+            self._parallel_search.close()
+            self._parallel_search = None
+
+    def whois(self, value):
+        """Знаходить імена контактів, яким належить телефон або електронна адреса, у порядку книги."""
+        return self._sort_names(self._get_owner_index().lookup(value))
 
     def get_birthdays_per_week(self, days_count: int):
         """Отримує дні народження за вказану кількість днів."""
-        users_to_congratulate_by_days = self._get_users_to_congratulate(
-            self.data.values(),
-            days_count
-        )
+        users_to_congratulate_by_days = self._get_users_to_congratulate(days_count)
 
         lines = []
         for day in sorted(users_to_congratulate_by_days.items()):
@@ -281,48 +663,100 @@ class AddressBook(UserDict):
 
         return '\n'.join(lines)
 
-    def _get_users_to_congratulate(self, users: list[Record], days_count: int):
+    def _get_users_to_congratulate(self, days_count: int):
         """Отримує користувачів, яких потрібно привітати."""
         start = datetime.now().date()
-        end = (start + timedelta(days=days_count - 1))
 
         users_to_congratulate = defaultdict(list)
-        for user in users:
-            if (user.birthday is None):
-                continue
-
-            congratulation_day = self._get_congratulation_day(
-                start,
-                user.birthday.value.date()
-            )
-
-            if (start <= congratulation_day and congratulation_day <= end):
-                users_to_congratulate[congratulation_day].append(
-                    user.name.value
-                )
+        congratulated = set()
+        # every birthday comes round within a year, so longer periods add nothing
+        for offset in range(min(days_count, 366)):
+            day = start + timedelta(days=offset)
+            for name in self._find_birthdays(day):
+                if name not in congratulated:
+                    congratulated.add(name)
+                    users_to_congratulate[day].append(name)
 
         return users_to_congratulate
 
-    def _get_congratulation_day(self, today, birthday):
-        """Отримує день, коли потрібно привітати."""
-        birthday_this_year = birthday.replace(year=today.year)
-
-        congratulation_day = birthday_this_year
-
-        # birthday will be next year
-        if (birthday_this_year < today):
-            congratulation_day = birthday_this_year.replace(
-                year=today.year + 1)
-
-        return congratulation_day
-    
     def today_birthdays(self):
         """Отримує імена контактів, у яких сьогодні день народження."""
-        today = datetime.now()
-        birthdays_today = []
-
-        for name in self:
-            record = self.find(name)
-            if record.birthday is not None and record.birthday.value.day == today.day and record.birthday.value.month == today.month:
-                birthdays_today.append(name)
-        return birthdays_today
+        return self._find_birthdays(datetime.now().date())
+
+    def _find_birthdays(self, day):
+        """Отримує імена контактів, яких потрібно привітати у вказаний день."""
+        names = self._find_by_birthday(day.month, day.day)
+        if (day.month == 2 and day.day == 28 and not calendar.isleap(day.year)):
+            # those born on 29 February are congratulated on 28 February in common years
+            names += self._find_by_birthday(2, 29)
+        return names
+
+    def _find_by_birthday(self, month, day):
+        """Отримує імена контактів з днем народження у вказаний день у порядку книги."""
+        return self._sort_names(self._get_birthday_index().lookup(month, day))
+
+    def _sort_names(self, names):
+        """Сортує імена контактів у порядку їх додавання до книги."""
+        return sorted(names, key=self._get_order().__getitem__)
+
+    def _reset_indexes(self):
+        """Скидає індекси книги, щоб вони були побудовані при першому зверненні."""
+        self._contact_index = None
+        self._birthday_index = None
+        self._owner_index = None
+        self._sorted_names = None
+        self._order = None
+        self._next_position = 0
+
+    def _get_contact_index(self):
+        """Повертає індекс контактів, будуючи його при першому зверненні."""
+        if self._contact_index is None:
+            index = ContactIndex()
+            for name, record in self.data.items():
+                index.add(name, record)
+            self._contact_index = index
+        return self._contact_index
+
+    def _get_birthday_index(self):
+        """Повертає календар днів народження, будуючи його при першому зверненні."""
+        if self._birthday_index is None:
+            index = BirthdayIndex()
+            for name, record in self.data.items():
+                index.add(name, record)
+            self._birthday_index = index
+        return self._birthday_index
+
+    def _get_owner_index(self):
+        """Повертає індекс власників телефонів та електронних адрес, будуючи його при першому зверненні."""
+        if self._owner_index is None:
+            index = OwnerIndex()
+            for name, record in self.data.items():
+                index.add(name, record)
+            self._owner_index = index
+        return self._owner_index
+
+    def _get_sorted_names(self):
+        """Повертає відсортований список імен, будуючи його при першому зверненні."""
+        if self._sorted_names is None:
+            self._sorted_names = SortedNames(self.data)
+        return self._sorted_names
+
+    def _get_order(self):
+        """Повертає порядкові номери контактів, будуючи їх при першому зверненні."""
+        if self._order is None:
+            self._order = {name: position for position, name in enumerate(self.data)}
+            self._next_position = len(self._order)
+        return self._order
+
+    def _index_record(self, record):
+        """Позначає запис зміненим і додає його до вже побудованих індексів."""
+        self._changes.setdefault(record.name.value, False)
+        for index in (self._contact_index, self._birthday_index, self._owner_index, self._parallel_search):
+            if index is not None:
+                index.add(record.name.value, record)
+
+    def _unindex_record(self, record):
+        """Видаляє запис з уже побудованих індексів."""
+        for index in (self._contact_index, self._birthday_index, self._owner_index, self._parallel_search):
+            if index is not None:
+                index.remove(record.name.value, record)
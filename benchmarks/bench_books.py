@@ -0,0 +1,131 @@
+"""
+Вимірює час та пікову пам'ять основних операцій AddressBook та NotesBook.
+
+Для кожного розміру створюються синтетичні книги з однаковою кількістю контактів
+та нотаток. Результати виводяться у форматі JSON, щоб їх можна було порівнювати
+між версіями.
+
+Запуск з кореня репозиторію:
+    python -m benchmarks.bench_books [--sizes 1000,100000,1000000] [--repeat 5] [--output results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import tempfile
+import time
+import tracemalloc
+from benchmarks.synthetic import make_address_book, make_notes_book
+from main import load_from_file, save_to_file
+from storage import write_snapshot
+
+
+def measure(func, repeat, setup=None):
+    """
+    Вимірює функцію repeat разів, а потім ще раз під tracemalloc для пікової пам'яті.
+
+    Args:
+        func (callable): Операція, що вимірюється.
+        repeat (int): Кількість вимірювань часу.
+        setup (callable): Підготовка перед кожним викликом, що не входить у вимірювання.
+
+    Returns:
+        dict: Найкращий та медіанний час у секундах і пікова пам'ять у байтах.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {'seconds': min(times), 'median_seconds': statistics.median(times), 'peak_bytes': peak}
+
+
+def bench_size(size, repeat):
+    """Вимірює всі операції на книгах вказаного розміру."""
+    results = {}
+
+    start = time.perf_counter()
+    address_book = make_address_book(size)
+    notes_book = make_notes_book(size)
+    # tracing the build would distort its time, so the process peak is reported instead
+    results['build'] = {
+        'seconds': time.perf_counter() - start,
+        'max_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    }
+    # a freshly built book counts every record as unsaved
+    address_book.pop_changes()
+    notes_book.pop_changes()
+
+    all_notes = notes_book.get_all_notes()
+    first_name = next(iter(address_book))
+
+    operations = {
+        # the first search builds the contact index
+        'search_contacts_cold': (lambda: address_book.search_contacts('ivan'), address_book._reset_indexes),
+        'search_contacts': (lambda: address_book.search_contacts('ivan'), None),
+        'get_birthdays_per_week': (lambda: address_book.get_birthdays_per_week(7), None),
+        'today_birthdays': (address_book.today_birthdays, None),
+        'find_notes_by_tags': (lambda: notes_book.find_notes_by_tags(['work', 'idea']), None),
+        'find_notes_by_tags_all': (lambda: notes_book.find_notes_by_tags(['work', 'idea'], match_all=True), None),
+        'sort_notes_by_tags': (lambda: notes_book.sort_notes_by_tags(all_notes, ['work']), None),
+    }
+    for name, (func, setup) in operations.items():
+        results[name] = measure(func, repeat, setup)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        # storage files are relative to the working directory
+        os.chdir(directory)
+        try:
+            results['write_snapshot'] = measure(lambda: write_snapshot(address_book, notes_book), repeat)
+            results['save_to_file'] = measure(
+                lambda: save_to_file(address_book, notes_book),
+                repeat,
+                lambda: address_book.find(first_name).add_address('Kyiv street 1'),
+            )
+            results['load_from_file'] = measure(load_from_file, repeat)
+        finally:
+            os.chdir(cwd)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark AddressBook and NotesBook operations')
+    parser.add_argument('--sizes', default='1000,100000,1000000',
+                        help='comma-separated numbers of contacts and notes (default: 1000,100000,1000000)')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per operation (default: 5)')
+    parser.add_argument('--output', help='write the JSON results to this file instead of stdout')
+    options = parser.parse_args()
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': options.repeat,
+        'results': {},
+    }
+    for size in [int(size) for size in options.sizes.split(',')]:
+        report['results'][str(size)] = bench_size(size, options.repeat)
+
+    output = json.dumps(report, indent=2)
+    if options.output is not None:
+        with open(options.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
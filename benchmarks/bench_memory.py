@@ -0,0 +1,28 @@
+"""
+Вимірює пам'ять, яку займає один контакт адресної книги.
+
+Запуск з кореня репозиторію:
+    python -m benchmarks.bench_memory [кількість контактів]
+"""
+import sys
+import tracemalloc
+from benchmarks.synthetic import make_address_book
+
+
+def bytes_per_contact(count):
+    """Повертає середню кількість байтів, виділених на один контакт книги."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    book = make_address_book(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(book)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f'{count} contacts: {bytes_per_contact(count):.0f} bytes per contact')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Порівнює пошук контактів в одному процесі з паралельним пошуком у різній кількості процесів.
+
+Для кожного режиму вимірюється перший запит (запуск процесів, передача частин книги
+та побудова індексів) і медіанний час повторних запитів окремо для слів, які шукаються
+за індексом, та для фраз з пробілами, для яких перебираються всі контакти. Результати
+паралельного пошуку порівнюються з пошуком в одному процесі.
+
+Запуск з кореня репозиторію:
+    python -m benchmarks.bench_parallel_search [--contacts 200000] [--processes 1,2,4] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import time
+from benchmarks.synthetic import make_address_book
+
+
+WORD_QUERIES = ['ivan', 'olena12', 'kyiv', '555', 'gmail']
+PHRASE_QUERIES = ['kyiv street 1', 'olena1; phones', 'street 12', 'user9@gmail']
+
+
+def time_queries(book, queries, repeat):
+    """Повертає медіанний час одного запиту в мілісекундах та знайдені імена для кожного запиту."""
+    times = []
+    found = {}
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            found[query] = [record.name.value for record in book.search_contacts(query)]
+            times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, found
+
+
+def bench_mode(book, processes, repeat):
+    """Вимірює пошук в одному процесі (processes=None) або у вказаній кількості процесів."""
+    if processes is not None:
+        book.enable_parallel_search(processes)
+    else:
+        book.disable_parallel_search()
+        book._reset_indexes()
+    try:
+        start = time.perf_counter()
+        book.search_contacts(WORD_QUERIES[0])
+        first = (time.perf_counter() - start) * 1000
+        word, word_found = time_queries(book, WORD_QUERIES, repeat)
+        phrase, phrase_found = time_queries(book, PHRASE_QUERIES, repeat)
+    finally:
+        book.disable_parallel_search()
+    return {'first': first, 'word': word, 'phrase': phrase, 'found': {**word_found, **phrase_found}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parallel contact search against a single process')
+    parser.add_argument('--contacts', type=int, default=200_000, help='contacts in the book (default: 200000)')
+    parser.add_argument('--processes', default=','.join(str(2 ** i) for i in range(8) if 2 ** i <= (os.cpu_count() or 1)),
+                        help='comma-separated process counts (default: powers of two up to the number of cores)')
+    parser.add_argument('--repeat', type=int, default=5, help='runs of every query (default: 5)')
+    options = parser.parse_args()
+
+    book = make_address_book(options.contacts)
+    print(f"{options.contacts} contacts, {os.cpu_count()} CPU cores")
+    print(f"{'mode':<14} {'first, ms':>10} {'word, ms':>10} {'phrase, ms':>11} {'phrase speedup':>15}")
+
+    serial = bench_mode(book, None, options.repeat)
+    print(f"{'1 process':<14} {serial['first']:>10.1f} {serial['word']:>10.2f} {serial['phrase']:>11.2f} {1:>14.2f}x")
+    for processes in [int(count) for count in options.processes.split(',')]:
+        result = bench_mode(book, processes, options.repeat)
+        if result['found'] != serial['found']:
+            raise AssertionError(f"Parallel search in {processes} processes found different contacts.")
+        speedup = serial['phrase'] / result['phrase']
+        label = f"{processes} workers"
+        print(f"{label:<14} {result['first']:>10.1f} {result['word']:>10.2f} {result['phrase']:>11.2f} {speedup:>14.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Навантажувальний клієнт сервера команд (info-cli --serve).
+
+Кожне з'єднання надсилає запити, тримаючи до --pipeline запитів без відповіді, а частка
+--write-ratio запитів додає контакти і тому чекає на збереження змін. Виводиться кількість
+запитів за секунду та перцентилі затримки від надсилання запиту до отримання відповіді.
+
+Без --address скрипт сам запускає сервер у тимчасовій директорії з синтетичними книгами.
+
+Запуск з кореня репозиторію:
+    python -m benchmarks.bench_server [--address unix:PATH|HOST:PORT] [--contacts 10000]
+        [--connections 8] [--pipeline 16] [--requests 20000] [--write-ratio 0.05]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from benchmarks.synthetic import make_address_book, make_notes_book
+from command_server import parse_address
+from instrumentation import percentile
+from storage import write_snapshot
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def run_connection(address, requests, pipeline, latencies):
+    """
+    Надсилає запити одним з'єднанням і записує затримку кожної відповіді.
+
+    Returns:
+        int: Кількість відповідей з помилкою.
+    """
+    kind, *where = parse_address(address)
+    if kind == 'unix':
+        reader, writer = await asyncio.open_unix_connection(where[0])
+    else:
+        reader, writer = await asyncio.open_connection(*where)
+
+    in_flight = asyncio.Semaphore(pipeline)
+    sent = deque()
+
+    async def send():
+        for request in requests:
+            await in_flight.acquire()
+            sent.append(time.perf_counter())
+            writer.write(json.dumps(request).encode() + b'\n')
+            await writer.drain()
+
+    async def receive():
+        errors = 0
+        for _ in requests:
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent.popleft())
+            in_flight.release()
+            if response['status'] != 0:
+                errors += 1
+        return errors
+
+    _, errors = await asyncio.gather(send(), receive())
+    writer.close()
+    await writer.wait_closed()
+    return errors
+
+
+def make_requests(names, count, write_ratio, seed):
+    """Створює запити пошуку телефонів та додавання нових контактів."""
+    rng = random.Random(seed)
+    requests = []
+    for i in range(count):
+        if rng.random() < write_ratio:
+            requests.append({'id': i, 'command': 'add', 'args': [f'Load{seed}x{i}', f'{rng.randrange(10 ** 10):010d}']})
+        else:
+            requests.append({'id': i, 'command': 'phone', 'args': [rng.choice(names)]})
+    return requests
+
+
+async def load_test(address, names, options):
+    """Виконує навантаження всіма з'єднаннями одночасно і повертає затримки, помилки та час."""
+    latencies = []
+    per_connection = options.requests // options.connections
+    start = time.perf_counter()
+    errors = await asyncio.gather(*[
+        run_connection(
+            address,
+            make_requests(names, per_connection, options.write_ratio, seed),
+            options.pipeline,
+            latencies,
+        )
+        for seed in range(options.connections)
+    ])
+    return latencies, sum(errors), time.perf_counter() - start
+
+
+def start_server(directory, contacts):
+    """Записує синтетичні книги у директорію і запускає в ній сервер на Unix-сокеті."""
+    address_book = make_address_book(contacts)
+    notes_book = make_notes_book(contacts)
+    cwd = os.getcwd()
+    # storage files are relative to the working directory
+    os.chdir(directory)
+    try:
+        write_snapshot(address_book, notes_book)
+    finally:
+        os.chdir(cwd)
+
+    path = os.path.join(directory, 'server.sock')
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'main.py'), '--serve', f'unix:{path}'],
+        cwd=directory,
+        stderr=subprocess.DEVNULL,
+    )
+    while not os.path.exists(path):
+        if server.poll() is not None:
+            raise RuntimeError("The server exited before it started listening.")
+        time.sleep(0.05)
+    return server, f'unix:{path}', list(address_book.data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the info-cli command server')
+    parser.add_argument('--address', help='address of a running server; by default a server is started')
+    parser.add_argument('--contacts', type=int, default=10_000,
+                        help='contacts in the books of the started server (default: 10000)')
+    parser.add_argument('--connections', type=int, default=8, help='concurrent connections (default: 8)')
+    parser.add_argument('--pipeline', type=int, default=16,
+                        help='requests sent ahead of their responses per connection (default: 16)')
+    parser.add_argument('--requests', type=int, default=20_000, help='requests over all connections (default: 20000)')
+    parser.add_argument('--write-ratio', type=float, default=0.05,
+                        help='share of requests that add a contact (default: 0.05)')
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        server = None
+        if options.address is None:
+            server, address, names = start_server(directory, options.contacts)
+        else:
+            address = options.address
+            names = [f'Olena{i}' for i in range(options.contacts)]
+        try:
+            latencies, errors, elapsed = asyncio.run(load_test(address, names, options))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    print(f"{len(latencies)} requests over {options.connections} connections "
+          f"(pipeline {options.pipeline}, writes {options.write_ratio:.0%}) in {elapsed:.2f} s")
+    print(f"{len(latencies) / elapsed:.0f} requests/s, {errors} errors")
+    for p in [50, 95, 99, 100]:
+        label = 'max' if p == 100 else f'p{p}'
+        print(f"latency {label:<4} {percentile(latencies, p) * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Вимірює час запуску info-cli та перевіряє, що важкі модулі не імпортуються під час запуску.
+
+Кожне вимірювання виконується у новому процесі інтерпретатора; береться найкращий час.
+Скрипт завершується з кодом 1, якщо запуск повільніший за бюджет або при імпорті main
+завантажується модуль, потрібний лише інтерактивному режиму чи окремим командам,
+тому його можна запускати як регресійну перевірку.
+
+Запуск з кореня репозиторію:
+    python -m benchmarks.bench_startup [--repeat 10] [--budget-ms 100]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules that only the interactive prompt or individual commands need
+LAZY_MODULES = [
+    'prompt_toolkit',
+    'sqlite3',
+    'importlib.metadata',
+    'cProfile',
+    'pstats',
+    'csv',
+    'json',
+    'tracemalloc',
+    'socketserver',
+]
+
+RUN_MAIN = "import sys; sys.path.insert(0, {root!r}); sys.argv = ['info-cli'] + sys.argv[1:]; import main; main.main()"
+
+
+def best_time(args, repeat, cwd):
+    """Повертає найкращий час виконання команди у новому процесі в мілісекундах."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, cwd=cwd, capture_output=True, check=False)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def import_time(repeat):
+    """Повертає найкращий сукупний час імпорту модуля main за -X importtime у мілісекундах."""
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import sys; sys.path.insert(0, {ROOT!r}); import main'],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in result.stderr.splitlines():
+            parts = line.split('|')
+            if len(parts) == 3 and parts[2].strip() == 'main':
+                elapsed = int(parts[1]) / 1000
+                best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def eagerly_imported():
+    """Повертає модулі зі списку LAZY_MODULES, які завантажуються вже при імпорті main."""
+    code = (
+        f'import sys; sys.path.insert(0, {ROOT!r}); import main; '
+        f'print(" ".join(name for name in {LAZY_MODULES!r} if name in sys.modules))'
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure info-cli startup time')
+    parser.add_argument('--repeat', type=int, default=10, help='runs per measurement (default: 10)')
+    parser.add_argument('--budget-ms', type=float, default=100,
+                        help='fail when a one-shot run is slower than this (default: 100)')
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        run_main = [sys.executable, '-c', RUN_MAIN.format(root=ROOT)]
+        results = {
+            'python -c pass': best_time([sys.executable, '-c', 'pass'], options.repeat, directory),
+            'import main': import_time(options.repeat),
+            'info-cli --version': best_time(run_main + ['--version'], options.repeat, directory),
+            'info-cli phone <name>': best_time(run_main + ['phone', 'Olena'], options.repeat, directory),
+        }
+
+    for name, elapsed in results.items():
+        print(f'{name:<24} {elapsed:8.1f} ms')
+
+    failed = False
+    eager = eagerly_imported()
+    if eager:
+        print(f"Imported at startup but should be lazy: {', '.join(eager)}")
+        failed = True
+    for name in ['info-cli --version', 'info-cli phone <name>']:
+        if results[name] > options.budget_ms:
+            print(f'{name} took {results[name]:.1f} ms, over the {options.budget_ms:.0f} ms budget')
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
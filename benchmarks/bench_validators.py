@@ -0,0 +1,43 @@
+"""
+Вимірює вартість одного створення полів Phone, Email та Birthday.
+
+Для Email та Birthday окремо вимірюються нові значення (перевірка виконується)
+та повторні значення (результат перевірки береться з кешу).
+
+Запуск з кореня репозиторію:
+    python -m benchmarks.bench_validators [кількість викликів]
+"""
+import sys
+import time
+from datetime import date, timedelta
+from address_book import Birthday, Email, Phone, is_valid_email, parse_birthday
+
+
+def per_call(field, values):
+    """Повертає середній час створення поля для кожного значення у мікросекундах."""
+    start = time.perf_counter()
+    for value in values:
+        field(value)
+    return (time.perf_counter() - start) / len(values) * 1_000_000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    phones = [f'{i:010d}' for i in range(count)]
+    emails = [f'user{i}@example.com' for i in range(count)]
+    # more distinct dates than the validation cache holds
+    birthdays = [(date(1950, 1, 1) + timedelta(days=i % 25_000)).strftime(Birthday.date_format) for i in range(count)]
+    repeated_emails = ['user@example.com'] * count
+    repeated_birthdays = ['01.02.1990'] * count
+
+    is_valid_email.cache_clear()
+    parse_birthday.cache_clear()
+    print(f'Phone:               {per_call(Phone, phones):.3f} us per call')
+    print(f'Email (new):         {per_call(Email, emails):.3f} us per call')
+    print(f'Email (repeated):    {per_call(Email, repeated_emails):.3f} us per call')
+    print(f'Birthday (new):      {per_call(Birthday, birthdays):.3f} us per call')
+    print(f'Birthday (repeated): {per_call(Birthday, repeated_birthdays):.3f} us per call')
+
+
+if __name__ == '__main__':
+    main()
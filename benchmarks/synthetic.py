@@ -0,0 +1,51 @@
+import random
+from address_book import AddressBook, Record
+from notes_book import Note, NotesBook
+
+
+FIRST_NAMES = ['Olena', 'Ivan', 'Petro', 'Anna', 'Oleh', 'Maria', 'Taras', 'Iryna', 'Andrii', 'Sofiia']
+CITIES = ['Kyiv', 'Lviv', 'Odesa', 'Kharkiv', 'Dnipro']
+DOMAINS = ['gmail.com', 'ukr.net', 'example.com']
+TAGS = ['work', 'home', 'idea', 'todo', 'travel', 'shopping', 'books', 'health']
+WORDS = ['meeting', 'project', 'call', 'buy', 'milk', 'plan', 'trip', 'report', 'read', 'doctor', 'budget', 'gift']
+
+
+def make_record(i, rng):
+    """Створює синтетичний запис контакту з номером i."""
+    record = Record(f'{rng.choice(FIRST_NAMES)}{i}')
+    record.add_phone(f'{rng.randrange(10 ** 10):010d}')
+    if i % 2 == 0:
+        record.add_phone(f'{rng.randrange(10 ** 10):010d}')
+    if i % 3 == 0:
+        record.add_email(f'user{i}@{rng.choice(DOMAINS)}')
+    if i % 4 == 0:
+        record.add_birthday(f'{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{rng.randint(1950, 2010)}')
+    if i % 5 == 0:
+        record.add_address(f'{rng.choice(CITIES)} street {rng.randint(1, 200)}')
+    return record
+
+
+def make_address_book(count, seed=0):
+    """Створює книгу контактів з count синтетичних записів."""
+    rng = random.Random(seed)
+    book = AddressBook()
+    for i in range(count):
+        book.add_record(make_record(i, rng))
+    return book
+
+
+def make_note(i, rng):
+    """Створює синтетичну нотатку з номером i."""
+    note = Note(f'Note {i}')
+    note.description = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 12)))
+    note.tags = rng.sample(TAGS, rng.randint(0, 3))
+    return note
+
+
+def make_notes_book(count, seed=0):
+    """Створює книгу нотаток з count синтетичних нотаток."""
+    rng = random.Random(seed)
+    book = NotesBook()
+    for i in range(count):
+        book.add_note(make_note(i, rng))
+    return book
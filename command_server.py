@@ -0,0 +1,208 @@
+import asyncio
+import io
+import json
+import os
+import re
+import signal
+import sys
+from contextlib import redirect_stdout
+from daemon import is_running
+
+
+# responses queued per connection before the server stops reading its requests
+MAX_PIPELINE = 128
+# longest request line in bytes
+MAX_REQUEST = 64 * 1024
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;]*m')
+
+
+def parse_address(address):
+    """
+    Розбирає адресу сервера.
+
+    Args:
+        address (str): 'unix:ШЛЯХ' для Unix-сокета, 'ХОСТ:ПОРТ' або 'ПОРТ' для TCP.
+
+    Returns:
+        tuple: ('unix', шлях) або ('tcp', хост, порт).
+    """
+    if address.startswith('unix:'):
+        return 'unix', address[len('unix:'):]
+    host, _, port = address.rpartition(':')
+    if not port.isdigit():
+        raise ValueError(f"Invalid address '{address}', use HOST:PORT or unix:PATH.")
+    return 'tcp', host or '127.0.0.1', int(port)
+
+
+def error(request_id, message):
+    """Повертає відповідь про помилку запиту."""
+    return {'id': request_id, 'status': 1, 'error': message}
+
+
+class CommandServer:
+    """
+    Клас CommandServer визначає asyncio-сервер, що виконує команди асистента за протоколом JSON-рядків.
+
+    Кожен рядок запиту - це {"id": ..., "command": назва, "args": [аргументи], "input": [рядки]},
+    де "input" містить відповіді на запитання команди. Кожен рядок відповіді - це
+    {"id": ..., "status": код завершення, "output": вивід команди без кольорів}.
+
+    Клієнт може надсилати запити, не чекаючи відповідей, а відповіді приходять у порядку
+    запитів. Команди виконуються по одній у потоці циклу подій, тож книгам не потрібні
+    замки. Зміни всіх команд, виконаних за одну ітерацію циклу, зберігаються одним записом,
+    і лише після цього клієнти отримують відповіді на команди, що змінюють книги. Якщо
+    клієнт не читає відповіді, сервер перестає читати його запити.
+
+    Атрибути:
+        execute (callable): Функція, що виконує команду за назвою та аргументами і повертає
+            виконану команду (Command) або None, якщо команду не знайдено.
+        save (callable): Функція, що зберігає зміни книг.
+        max_pipeline (int): Кількість відповідей у черзі з'єднання, після якої читання запитів призупиняється.
+        pending (list): Відповіді на команди, що чекають на збереження змін.
+
+    """
+
+    def __init__(self, execute, save, max_pipeline=MAX_PIPELINE):
+        self.execute = execute
+        self.save = save
+        self.max_pipeline = max_pipeline
+        self.pending = []
+
+    async def handle_connection(self, reader, writer):
+        """Читає запити з'єднання та ставить відповіді у чергу відправлення."""
+        responses = asyncio.Queue(self.max_pipeline)
+        sender = asyncio.create_task(self._send(responses, writer))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await responses.put(self._resolved(error(None, f"Requests are limited to {MAX_REQUEST} bytes.")))
+                    break
+                if not line:
+                    break
+                # waits here while the queue is full, so unread responses stop the reading
+                await responses.put(self._respond(line))
+        except ConnectionError:
+            pass
+        finally:
+            await responses.put(None)
+            await sender
+            writer.close()
+
+    def _respond(self, line):
+        """Виконує запит і повертає future з відповіддю."""
+        try:
+            request = json.loads(line)
+            command = str(request['command']).lower()
+            args = [str(arg) for arg in request.get('args', [])]
+            input_lines = [str(input_line) for input_line in request.get('input', [])]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return self._resolved(error(None, "Invalid request."))
+        request_id = request.get('id')
+
+        output = io.StringIO()
+        stdin = sys.stdin
+        # prompts of interactive commands read the lines sent with the request
+        sys.stdin = io.StringIO(''.join(f'{input_line}\n' for input_line in input_lines))
+        try:
+            with redirect_stdout(output):
+                entry = self.execute(command, args)
+        except EOFError:
+            return self._resolved(error(request_id, "The command needs more input lines."))
+        except Exception as e:
+            return self._resolved(error(request_id, f"{type(e).__name__}: {e}"))
+        finally:
+            sys.stdin = stdin
+
+        response = {
+            'id': request_id,
+            'status': 0 if entry is not None else 1,
+            'output': ANSI_ESCAPE.sub('', output.getvalue()),
+        }
+        if entry is None or not entry.mutates:
+            return self._resolved(response)
+
+        future = asyncio.get_running_loop().create_future()
+        if not self.pending:
+            # runs after the other requests that are ready in this iteration of the loop
+            asyncio.get_running_loop().call_soon(self.flush)
+        self.pending.append((future, response))
+        return future
+
+    def flush(self):
+        """Зберігає зміни книг одним записом і відповідає на команди, що їх зробили."""
+        batch, self.pending = self.pending, []
+        try:
+            self.save()
+        except Exception as e:
+            for future, response in batch:
+                future.set_result(error(response['id'], f"Saving failed: {e}"))
+            return
+        for future, response in batch:
+            future.set_result(response)
+
+    def _resolved(self, response):
+        """Повертає future, що вже містить відповідь."""
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(response)
+        return future
+
+    async def _send(self, responses, writer):
+        """Надсилає відповіді у порядку запитів, чекаючи, поки клієнт їх прочитає."""
+        connected = True
+        while True:
+            future = await responses.get()
+            if future is None:
+                return
+            response = await future
+            if not connected:
+                # keeps emptying the queue so the reading side is never stuck on a lost client
+                continue
+            try:
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+            except ConnectionError:
+                connected = False
+
+
+async def _serve(address, server):
+    """Приймає з'єднання, доки не буде отримано SIGINT або SIGTERM."""
+    kind, *where = parse_address(address)
+    if kind == 'unix':
+        if is_running(where[0]):
+            raise RuntimeError(f"A server is already running on {where[0]}.")
+        if os.path.exists(where[0]):
+            os.remove(where[0])
+        listener = await asyncio.start_unix_server(server.handle_connection, where[0], limit=MAX_REQUEST)
+    else:
+        listener = await asyncio.start_server(server.handle_connection, *where, limit=MAX_REQUEST)
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in [signal.SIGINT, signal.SIGTERM]:
+        loop.add_signal_handler(signum, stopped.set)
+
+    print(f"Serving commands on {address}, press Ctrl+C to stop.", file=sys.stderr)
+    try:
+        await stopped.wait()
+    finally:
+        # connected clients are not waited for, their unsaved changes are saved below
+        listener.close()
+        if kind == 'unix':
+            os.remove(where[0])
+        if server.pending:
+            server.flush()
+
+
+def serve(address, execute, save, max_pipeline=MAX_PIPELINE):
+    """
+    Запускає сервер команд і обслуговує клієнтів, доки процес не перервуть.
+
+    Args:
+        address (str): 'unix:ШЛЯХ' для Unix-сокета, 'ХОСТ:ПОРТ' або 'ПОРТ' для TCP.
+        execute (callable): Функція, що виконує команду за назвою та аргументами.
+        save (callable): Функція, що зберігає зміни книг.
+        max_pipeline (int): Кількість відповідей у черзі з'єднання, після якої читання запитів призупиняється.
+    """
+    asyncio.run(_serve(address, CommandServer(execute, save, max_pipeline)))
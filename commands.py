@@ -0,0 +1,95 @@
+import functools
+
+
+# third-party packages register commands under this entry point group
+ENTRY_POINT_GROUP = 'info_cli.commands'
+
+
+class Command:
+    """
+    Клас Command описує команду асистента.
+
+    Атрибути:
+        name (str): Назва команди.
+        handler (callable): Функція, що виконує команду.
+        args (str): Опис аргументів команди для довідки.
+        help (str): Пояснення команди для довідки.
+        mutates (bool): Чи змінює команда книги.
+        book (str): Книга, з якою працює команда: 'contacts', 'notes' або None для обох.
+
+    """
+
+    def __init__(self, name, handler, args='', help='', mutates=False, book=None):
+        self.name = name
+        self.handler = handler
+        self.args = args
+        self.help = help
+        self.mutates = mutates
+        self.book = book
+
+    def run(self, args, address_book, notes_book):
+        """Виконує команду і повертає її результат."""
+        if self.book == 'contacts':
+            return self.handler(args, address_book)
+        if self.book == 'notes':
+            return self.handler(args, notes_book)
+        return self.handler(args, address_book, notes_book)
+
+
+COMMANDS = {}
+
+
+def command(name, args='', help='', mutates=False, book=None):
+    """
+    Декоратор, який реєструє функцію як команду асистента.
+
+    Args:
+        name (str): Назва команди.
+        args (str): Опис аргументів команди для довідки.
+        help (str): Пояснення команди для довідки.
+        mutates (bool): Чи змінює команда книги.
+        book (str): Книга, з якою працює команда: 'contacts', 'notes' або None для обох.
+
+    Returns:
+        callable: Декоратор, що повертає функцію без змін.
+    """
+    def register(func):
+        COMMANDS[name] = Command(name, func, args, help, mutates, book)
+        return func
+
+    return register
+
+
+@functools.cache
+def plugin_entry_points():
+    """
+    Повертає точки входу сторонніх команд без імпорту їхніх модулів.
+
+    Returns:
+        dict: Відповідність назви команди точці входу.
+    """
+    # importlib.metadata is slow to import and only needed once plugins are looked up
+    from importlib.metadata import entry_points
+
+    return {entry_point.name: entry_point for entry_point in entry_points(group=ENTRY_POINT_GROUP)}
+
+
+def find_command(name):
+    """
+    Знаходить команду за назвою, імпортуючи сторонній модуль при першому зверненні.
+
+    Args:
+        name (str): Назва команди.
+
+    Returns:
+        Command: Команда або None, якщо такої команди немає.
+    """
+    if name not in COMMANDS and name in plugin_entry_points():
+        # the plugin module registers its commands with @command on import
+        plugin_entry_points()[name].load()
+    return COMMANDS.get(name)
+
+
+def command_names():
+    """Повертає назви всіх команд, включно зі сторонніми, які ще не завантажено."""
+    return sorted(set(COMMANDS) | set(plugin_entry_points()))
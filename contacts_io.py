@@ -0,0 +1,285 @@
+import csv
+import os
+import re
+from datetime import datetime
+from itertools import islice
+from address_book import Birthday, EMAIL_PATTERN, Record
+
+
+CSV_FIELDS = ['name', 'phones', 'emails', 'birthday', 'address']
+# phones and emails share one CSV cell
+LIST_SEPARATOR = ';'
+VCARD_DATE_FORMATS = ['%Y-%m-%d', '%Y%m%d']
+
+
+def contact_format(path):
+    """
+    Визначає формат файлу контактів за його розширенням.
+
+    Args:
+        path (str): Шлях до файлу.
+
+    Returns:
+        str: 'csv' або 'vcard'.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ['.vcf', '.vcard']:
+        return 'vcard'
+    raise ValueError(f"Unsupported contacts file '{path}', use .csv or .vcf.")
+
+
+def read_csv(path):
+    """Читає рядки контактів з CSV-файлу по одному."""
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield {
+                'name': (row.get('name') or '').strip(),
+                'phones': _split_list(row.get('phones')),
+                'emails': _split_list(row.get('emails')),
+                'birthday': (row.get('birthday') or '').strip(),
+                'address': (row.get('address') or '').strip(),
+            }
+
+
+def read_vcard(path):
+    """Читає контакти з файлу vCard по одному."""
+    contact = None
+    for line in _unfolded_lines(path):
+        name, _, value = line.partition(':')
+        # drop parameters such as TEL;TYPE=CELL
+        name = name.split(';')[0].upper()
+        if name == 'BEGIN':
+            contact = {'name': '', 'phones': [], 'emails': [], 'birthday': '', 'address': ''}
+        elif contact is None:
+            continue
+        elif name == 'END':
+            yield contact
+            contact = None
+        elif name == 'FN':
+            contact['name'] = _unescape(value).strip()
+        elif name == 'TEL':
+            contact['phones'].append(''.join(ch for ch in value if ch.isdigit()))
+        elif name == 'EMAIL':
+            contact['emails'].append(value.strip())
+        elif name == 'BDAY':
+            contact['birthday'] = _vcard_birthday(value.strip())
+        elif name == 'ADR':
+            contact['address'] = ' '.join(_unescape(part) for part in re.split(r'(?<!\\);', value) if part.strip())
+
+
+def write_csv(path, records):
+    """Записує записи контактів у CSV-файл по одному."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        for record in records:
+            writer.writerow(_record_row(record))
+
+
+def write_vcard(path, records):
+    """Записує записи контактів у файл vCard 3.0 по одному."""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for record in records:
+            lines = ['BEGIN:VCARD', 'VERSION:3.0', f'FN:{_escape(record.name.value)}']
+            lines += [f'TEL;TYPE=CELL:{phone.value}' for phone in record.phones]
+            lines += [f'EMAIL:{email.value}' for email in record.emails]
+            if record.birthday is not None:
+                lines.append(f'BDAY:{record.birthday.value.strftime("%Y-%m-%d")}')
+            if record.address is not None:
+                lines.append(f'ADR:;;{_escape(record.address.value)};;;;')
+            lines.append('END:VCARD')
+            f.write('\r\n'.join(lines) + '\r\n')
+
+
+def validate_batch(rows):
+    """
+    Перевіряє пакет рядків контактів.
+
+    Довжина всіх телефонів пакета перевіряється одним проходом, а електронні адреси -
+    одним скомпільованим регулярним виразом.
+
+    Args:
+        rows (list): Рядки контактів.
+
+    Returns:
+        list: Повідомлення про помилку для кожного рядка або None для коректних рядків.
+    """
+    errors = [None if row['name'] else 'missing name' for row in rows]
+
+    phone_lengths_ok = [all(len(phone) == 10 for phone in row['phones']) for row in rows]
+    emails_ok = [all(EMAIL_PATTERN.fullmatch(email) for email in row['emails']) for row in rows]
+    for i, row in enumerate(rows):
+        if errors[i] is not None:
+            continue
+        if not row['phones']:
+            errors[i] = 'missing phone'
+        elif not phone_lengths_ok[i]:
+            errors[i] = 'phone number length should be 10'
+        elif not emails_ok[i]:
+            errors[i] = 'invalid email'
+        elif row['birthday'] and not _is_birthday(row['birthday']):
+            errors[i] = 'birthday should have format DD.MM.YYYY'
+    return errors
+
+
+def import_contacts(book, path, reject_path=None, batch_size=1000):
+    """
+    Імпортує контакти з CSV- або vCard-файлу пакетами.
+
+    Файл читається потоково. Команди приймають ім'я одним словом, тому слова імені
+    з'єднуються через '_' ('Olena Petrenko' стає 'Olena_Petrenko'). Некоректні рядки
+    записуються у CSV-файл відхилених рядків з причиною помилки, який створюється лише
+    при першому відхиленому рядку. Контакти з уже наявними іменами доповнюються новими даними.
+
+    Args:
+        book (AddressBook): Книга контактів.
+        path (str): Шлях до файлу.
+        reject_path (str): Шлях до файлу відхилених рядків (за замовчуванням '<path>.rejects.csv').
+        batch_size (int): Кількість рядків у пакеті перевірки.
+
+    Returns:
+        tuple: Кількість імпортованих та відхилених контактів.
+    """
+    rows = read_csv(path) if contact_format(path) == 'csv' else read_vcard(path)
+    reject_path = reject_path or f'{path}.rejects.csv'
+
+    imported = 0
+    rejected = 0
+    reject_file = None
+    try:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            for row in batch:
+                row['name'] = single_word_name(row['name'])
+            for row, error in zip(batch, validate_batch(batch)):
+                if error is None:
+                    _merge_row(book, row)
+                    imported += 1
+                    continue
+                if reject_file is None:
+                    reject_file = open(reject_path, 'w', newline='', encoding='utf-8')
+                    rejects = csv.writer(reject_file)
+                    rejects.writerow(CSV_FIELDS + ['error'])
+                rejects.writerow([
+                    row['name'],
+                    LIST_SEPARATOR.join(row['phones']),
+                    LIST_SEPARATOR.join(row['emails']),
+                    row['birthday'],
+                    row['address'],
+                    error,
+                ])
+                rejected += 1
+    finally:
+        if reject_file is not None:
+            reject_file.close()
+        elif os.path.exists(reject_path):
+            # rejects of an earlier import of the same file no longer apply
+            os.remove(reject_path)
+    return imported, rejected
+
+
+def single_word_name(name):
+    """Повертає ім'я одним словом, з'єднуючи його слова через '_'."""
+    return '_'.join(name.split())
+
+
+def export_contacts(book, path):
+    """
+    Експортує всі контакти книги у CSV- або vCard-файл.
+
+    Args:
+        book (AddressBook): Книга контактів.
+        path (str): Шлях до файлу.
+
+    Returns:
+        int: Кількість експортованих контактів.
+    """
+    if contact_format(path) == 'csv':
+        write_csv(path, book.values())
+    else:
+        write_vcard(path, book.values())
+    return len(book)
+
+
+def _merge_row(book, row):
+    """Додає перевірений рядок до книги, доповнюючи наявний контакт з тим самим іменем."""
+    try:
+        record = book.find(row['name'])
+    except KeyError:
+        record = Record(row['name'])
+    for phone in row['phones']:
+        if record.find_phone(phone) is None:
+            record.add_phone(phone)
+    for email in row['emails']:
+        if record.find_email(email) is None:
+            record.add_email(email)
+    if row['birthday']:
+        record.add_birthday(row['birthday'])
+    if row['address']:
+        record.add_address(row['address'])
+    book.add_record(record)
+
+
+def _record_row(record):
+    """Повертає рядок CSV для запису контакту."""
+    return [
+        record.name.value,
+        LIST_SEPARATOR.join(phone.value for phone in record.phones),
+        LIST_SEPARATOR.join(email.value for email in record.emails),
+        record.birthday.value.strftime(Birthday.date_format) if record.birthday is not None else '',
+        record.address.value if record.address is not None else '',
+    ]
+
+
+def _split_list(value):
+    """Розбиває клітинку CSV зі списком значень."""
+    return [item.strip() for item in (value or '').split(LIST_SEPARATOR) if item.strip()]
+
+
+def _is_birthday(value):
+    """Перевіряє формат дати народження."""
+    try:
+        datetime.strptime(value, Birthday.date_format)
+        return True
+    except ValueError:
+        return False
+
+
+def _vcard_birthday(value):
+    """Перетворює дату vCard у формат DD.MM.YYYY; некоректна дата повертається без змін."""
+    for date_format in VCARD_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).strftime(Birthday.date_format)
+        except ValueError:
+            pass
+    return value
+
+
+def _unfolded_lines(path):
+    """Повертає логічні рядки vCard, з'єднуючи перенесені рядки."""
+    pending = None
+    with open(path, encoding='utf-8') as f:
+        for raw_line in f:
+            line = raw_line.rstrip('\r\n')
+            if line[:1] in [' ', '\t'] and pending is not None:
+                pending += line[1:]
+                continue
+            if pending is not None:
+                yield pending
+            pending = line
+    if pending is not None:
+        yield pending
+
+
+def _escape(value):
+    """Екранує спеціальні символи vCard."""
+    return value.replace('\\', '\\\\').replace(',', '\\,').replace(';', '\\;')
+
+
+def _unescape(value):
+    """Скасовує екранування спеціальних символів vCard."""
+    return value.replace('\\,', ',').replace('\\;', ';').replace('\\n', ' ').replace('\\\\', '\\')
@@ -0,0 +1,223 @@
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+from contextlib import redirect_stdout
+
+
+# sockets live next to the storage files, one per storage so books are never mixed up
+SOCKET_FILE = 'info_cli-{storage}.sock'
+
+
+def socket_path(storage='pickle'):
+    """Повертає шлях до сокета демона, що обслуговує вказане сховище."""
+    return SOCKET_FILE.format(storage=storage)
+
+
+class SocketOutput(io.TextIOBase):
+    """
+    Клас SocketOutput визначає стандартний вивід команди, що виконується демоном.
+
+    Виведений текст накопичується і надсилається клієнту одним повідомленням
+    перед запитом введення та після завершення команди.
+
+    Атрибути:
+        wfile (file): Бінарний потік запису у сокет клієнта.
+        buffer (list): Текст, ще не надісланий клієнту.
+
+    """
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self.buffer = []
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        self.buffer.append(text)
+        return len(text)
+
+    def flush(self):
+        if self.buffer:
+            send_message(self.wfile, {'output': ''.join(self.buffer)})
+            self.buffer = []
+
+
+class SocketInput(io.TextIOBase):
+    """
+    Клас SocketInput визначає стандартний ввід команди, що виконується демоном.
+
+    Кожен рядок запитується у клієнта, тож команди, що питають дані через input(),
+    працюють так само, як і без демона.
+
+    Атрибути:
+        rfile (file): Бінарний потік читання з сокета клієнта.
+        output (SocketOutput): Вивід команди, що надсилається перед запитом рядка.
+
+    """
+
+    def __init__(self, rfile, output):
+        self.rfile = rfile
+        self.output = output
+
+    def readable(self):
+        return True
+
+    def readline(self, size=-1):
+        self.output.flush()
+        send_message(self.output.wfile, {'input': True})
+        message = read_message(self.rfile)
+        # a closed connection or a client without input reads as the end of input
+        if message is None or message.get('line') is None:
+            return ''
+        return message['line']
+
+
+def send_message(wfile, message):
+    """Надсилає повідомлення одним рядком JSON."""
+    wfile.write(json.dumps(message).encode() + b'\n')
+    wfile.flush()
+
+
+def read_message(rfile):
+    """Читає повідомлення з рядка JSON або повертає None, якщо з'єднання закрито."""
+    line = rfile.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    """
+    Клас CommandHandler виконує одну команду, отриману від клієнта.
+
+    Клієнт надсилає {"command": [назва, аргументи...]}, отримує вивід команди
+    повідомленнями {"output": текст}, на запит {"input": true} відповідає
+    {"line": рядок або null} і наприкінці отримує {"status": код завершення}.
+
+    """
+
+    def handle(self):
+        request = read_message(self.rfile)
+        if request is None:
+            return
+
+        output = SocketOutput(self.wfile)
+        stdin = sys.stdin
+        sys.stdin = SocketInput(self.rfile, output)
+        try:
+            with redirect_stdout(output):
+                status = self.server.execute(request['command'])
+        except Exception as e:
+            output.write(f"{e}\n")
+            status = 1
+        finally:
+            sys.stdin = stdin
+        output.flush()
+        send_message(self.wfile, {'status': status})
+
+
+class CommandServer(socketserver.UnixStreamServer):
+    """
+    Клас CommandServer визначає демон, що тримає книги у пам'яті і виконує команди клієнтів.
+
+    Команди виконуються по одній, у порядку підключення клієнтів, тому їм не потрібні
+    додаткові замки, а стандартні потоки можна підмінювати на час команди.
+
+    Атрибути:
+        execute (callable): Функція, що виконує команду зі списку її назви та аргументів
+            і повертає код завершення.
+
+    """
+
+    def __init__(self, path, execute):
+        super().__init__(path, CommandHandler)
+        self.execute = execute
+
+
+def is_running(path):
+    """Перевіряє, чи приймає демон з'єднання на сокеті."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+    except OSError:
+        return False
+    return True
+
+
+def serve(path, execute):
+    """
+    Обслуговує команди клієнтів на сокеті, доки процес не перервуть.
+
+    Сокет, що лишився після аварійно завершеного демона, видаляється. SIGTERM
+    зупиняє демон так само, як Ctrl+C; після зупинки відновлюється попередній обробник SIGTERM.
+
+    Args:
+        path (str): Шлях до сокета.
+        execute (callable): Функція, що виконує команду і повертає код завершення.
+
+    Raises:
+        RuntimeError: Якщо на сокеті вже працює інший демон.
+    """
+    if is_running(path):
+        raise RuntimeError(f"A daemon is already running on {path}.")
+    if os.path.exists(path):
+        os.remove(path)
+
+    previous_handler = signal.signal(signal.SIGTERM, _interrupt)
+    try:
+        with CommandServer(path, execute) as server:
+            try:
+                server.serve_forever()
+            finally:
+                os.remove(path)
+    finally:
+        # a second SIGTERM must not interrupt the final snapshot written by the caller
+        signal.signal(signal.SIGTERM, previous_handler)
+
+
+def _interrupt(signum, frame):
+    """Перериває обслуговування команд при отриманні сигналу."""
+    raise KeyboardInterrupt
+
+
+def send_command(path, command_line):
+    """
+    Виконує команду у демоні, виводячи її результат і передаючи їй рядки стандартного вводу.
+
+    Args:
+        path (str): Шлях до сокета.
+        command_line (list): Назва команди та її аргументи.
+
+    Returns:
+        int: Код завершення команди або None, якщо демон не запущено.
+    """
+    if getattr(socket, 'AF_UNIX', None) is None or not os.path.exists(path):
+        return None
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(path)
+    except OSError:
+        # a socket left behind by a daemon that is gone
+        client.close()
+        return None
+
+    with client, client.makefile('rb') as rfile, client.makefile('wb') as wfile:
+        send_message(wfile, {'command': command_line})
+        while True:
+            message = read_message(rfile)
+            if message is None:
+                raise ConnectionError("The daemon closed the connection.")
+            if 'output' in message:
+                sys.stdout.write(message['output'])
+                sys.stdout.flush()
+            elif 'input' in message:
+                line = sys.stdin.readline()
+                send_message(wfile, {'line': line or None})
+            else:
+                return message['status']
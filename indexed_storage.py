@@ -0,0 +1,445 @@
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+from collections import defaultdict
+from collections.abc import MutableMapping
+from address_book import AddressBook, Record, normalize_phone
+
+
+MAGIC = b'ICLIAB02'
+# files of the first version have no phone index between the name and birthday indexes
+MAGIC_V1 = b'ICLIAB01'
+
+# magic, number of records, offset of the name index, offset of the birthday index
+HEADER = struct.Struct('<8sQQQ')
+# name length, pickled record length, birthday key
+FRAME = struct.Struct('<IIH')
+# name hash, frame offset
+NAME_ENTRY = struct.Struct('<QQ')
+# phone key, frame offset
+PHONE_ENTRY = struct.Struct('<QQ')
+# birthday key, frame offset
+BIRTHDAY_ENTRY = struct.Struct('<HQ')
+
+
+def name_hash(name):
+    """Повертає стабільний 64-бітний хеш імені контакту."""
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), 'little')
+
+
+def phone_key(phone):
+    """Повертає ключ нормалізованого номера телефону для індексу."""
+    return name_hash(normalize_phone(phone))
+
+
+def record_phone_keys(record):
+    """Повертає ключі всіх номерів телефону запису без повторів."""
+    return sorted({phone_key(phone.value) for phone in record.phones})
+
+
+def birthday_key(month, day):
+    """Повертає ключ дня народження для індексу (0 означає відсутність дня народження)."""
+    return month * 32 + day
+
+
+def record_birthday_key(record):
+    """Повертає ключ дня народження запису."""
+    if record.birthday is None:
+        return 0
+    return birthday_key(record.birthday.value.month, record.birthday.value.day)
+
+
+def is_indexed_file(path):
+    """Перевіряє, чи файл збережено у форматі з індексом."""
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) in (MAGIC, MAGIC_V1)
+
+
+class IndexedRecords(MutableMapping):
+    """
+    Клас IndexedRecords визначає словник записів, відображених з файлу у пам'ять.
+
+    Запис декодується лише тоді, коли до нього звертаються. Змінені, додані та видалені
+    записи зберігаються поверх файлу до наступного знімку.
+
+    Атрибути:
+        path (str): Шлях до файлу.
+        book (AddressBook): Книга, якій належать записи.
+        cache (dict): Декодовані або змінені записи з файлу.
+        changed (set): Імена записів файлу, змінених після запису знімку.
+        added (dict): Записи, яких немає у файлі, у порядку додавання.
+        removed (set): Імена записів файлу, які було видалено.
+
+    """
+
+    def __init__(self, path, book):
+        self.path = path
+        self._map_file()
+        self.book = book
+        self.cache = {}
+        self.changed = set()
+        self.added = {}
+        self.removed = set()
+
+    def __getitem__(self, name):
+        if name in self.added:
+            return self.added[name]
+        if name in self.removed:
+            raise KeyError(name)
+        if name not in self.cache:
+            offset = self._find_frame(name)
+            if offset is None:
+                raise KeyError(name)
+            record = pickle.loads(self._read_frame(offset)[1])
+            record._book = self.book
+            self.cache[name] = record
+        return self.cache[name]
+
+    def __setitem__(self, name, record):
+        if name in self.added or name in self.removed or self._find_frame(name) is None:
+            self.added[name] = record
+        else:
+            self.cache[name] = record
+            self.changed.add(name)
+
+    def __delitem__(self, name):
+        if name in self.added:
+            del self.added[name]
+        elif name not in self.removed and self._find_frame(name) is not None:
+            self.removed.add(name)
+            self.cache.pop(name, None)
+            self.changed.discard(name)
+        else:
+            raise KeyError(name)
+
+    def __contains__(self, name):
+        if name in self.added:
+            return True
+        return name not in self.removed and self._find_frame(name) is not None
+
+    def __iter__(self):
+        for _, name in self._file_names():
+            if name not in self.removed:
+                yield name
+        yield from list(self.added)
+
+    def __len__(self):
+        return self.file_count - len(self.removed) + len(self.added)
+
+    def remap(self, saved):
+        """
+        Знову відображає файл у пам'ять після того, як його було закрито для заміни.
+
+        Args:
+            saved (bool): Чи замінено файл знімком поточних записів; тоді змінені та додані
+                записи вже є у файлі, а видалених записів у ньому немає.
+        """
+        self._map_file()
+        if saved:
+            # decoded records stay the same objects the book has handed out
+            self.cache.update(self.added)
+            self.changed = set()
+            self.added = {}
+            self.removed = set()
+
+    @property
+    def has_phone_index(self):
+        """Чи містить файл індекс номерів телефону."""
+        return self.magic == MAGIC
+
+    def mark_changed(self, name):
+        """Позначає декодований запис файлу зміненим, щоб він записувався у знімок заново."""
+        if name in self.cache:
+            self.changed.add(name)
+
+    def frames(self):
+        """Повертає ім'я, серіалізований запис, ключ дня народження та ключі телефонів для кожного запису."""
+        file_phones = defaultdict(list)
+        for i in range(self._phone_count()):
+            key, offset = PHONE_ENTRY.unpack_from(self.map, self.phone_offset + i * PHONE_ENTRY.size)
+            file_phones[offset].append(key)
+
+        for offset, name in self._file_names():
+            if name in self.removed:
+                continue
+            if name in self.changed:
+                record = self.cache[name]
+                yield name, pickle.dumps(record), record_birthday_key(record), record_phone_keys(record)
+            else:
+                _, blob, key = self._read_frame(offset)
+                if self.has_phone_index:
+                    phones = file_phones[offset]
+                else:
+                    phones = record_phone_keys(pickle.loads(blob))
+                yield name, blob, key, phones
+        for name, record in self.added.items():
+            yield name, pickle.dumps(record), record_birthday_key(record), record_phone_keys(record)
+
+    def find_birthdays(self, month, day):
+        """Повертає імена контактів з днем народження у вказаний день у порядку книги."""
+        key = birthday_key(month, day)
+        found = {}
+        count = (len(self.map) - self.birthday_offset) // BIRTHDAY_ENTRY.size
+        i = self._lower_bound(BIRTHDAY_ENTRY, self.birthday_offset, count, key)
+        while i < count:
+            entry_key, offset = BIRTHDAY_ENTRY.unpack_from(self.map, self.birthday_offset + i * BIRTHDAY_ENTRY.size)
+            if entry_key != key:
+                break
+            name = self._read_frame(offset)[0]
+            if name not in self.removed and name not in self.added and name not in self.changed:
+                found[name] = offset
+            i += 1
+
+        # records changed since the snapshot may have a different birthday now
+        for name in self.changed:
+            if record_birthday_key(self.cache[name]) == key:
+                found[name] = self._find_frame(name)
+        for position, (name, record) in enumerate(self.added.items()):
+            if record_birthday_key(record) == key:
+                found[name] = len(self.map) + position
+
+        return sorted(found, key=found.get)
+
+    def find_phone_owners(self, phone):
+        """Повертає імена контактів, яким належить номер телефону, у порядку книги."""
+        phone = normalize_phone(phone)
+        key = phone_key(phone)
+        found = {}
+        count = self._phone_count()
+        i = self._lower_bound(PHONE_ENTRY, self.phone_offset, count, key)
+        while i < count:
+            entry_key, offset = PHONE_ENTRY.unpack_from(self.map, self.phone_offset + i * PHONE_ENTRY.size)
+            if entry_key != key:
+                break
+            name = self._read_frame(offset)[0]
+            if name not in self.removed and name not in self.added and name not in self.changed:
+                found[name] = offset
+            i += 1
+
+        # records changed since the snapshot may have other phones now
+        for name in self.changed:
+            if key in record_phone_keys(self.cache[name]):
+                found[name] = self._find_frame(name)
+        for position, (name, record) in enumerate(self.added.items()):
+            if key in record_phone_keys(record):
+                found[name] = len(self.map) + position
+
+        # different phones may share a key, so the owners are checked by their phones
+        return [
+            name for name in sorted(found, key=found.get)
+            if any(normalize_phone(p.value) == phone for p in self[name].phones)
+        ]
+
+    def _map_file(self):
+        """Відображає файл у пам'ять і перевіряє його заголовок."""
+        with open(self.path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.magic, self.file_count, self.index_offset, self.birthday_offset = HEADER.unpack_from(self.map, 0)
+        self.phone_offset = self.index_offset + self.file_count * NAME_ENTRY.size
+        # the header is written last, so a cut short or unfinished file fails these checks
+        if (self.file_count == 0 and self.index_offset == 0) \
+                or self.phone_offset > self.birthday_offset \
+                or (self.birthday_offset - self.phone_offset) % PHONE_ENTRY.size != 0 \
+                or (not self.has_phone_index and self.phone_offset != self.birthday_offset) \
+                or self.birthday_offset > len(self.map) \
+                or (len(self.map) - self.birthday_offset) % BIRTHDAY_ENTRY.size != 0:
+            self.map.close()
+            raise ValueError(f"'{self.path}' is incomplete")
+
+    def _phone_count(self):
+        """Повертає кількість елементів індексу номерів телефону."""
+        return (self.birthday_offset - self.phone_offset) // PHONE_ENTRY.size
+
+    def _file_names(self):
+        """Повертає зміщення та ім'я кожного запису файлу, не декодуючи самі записи."""
+        offset = HEADER.size
+        for _ in range(self.file_count):
+            name_length, blob_length, _ = FRAME.unpack_from(self.map, offset)
+            start = offset + FRAME.size
+            yield offset, self.map[start:start + name_length].decode()
+            offset = start + name_length + blob_length
+
+    def _read_frame(self, offset):
+        """Повертає ім'я, серіалізований запис та ключ дня народження за зміщенням."""
+        name_length, blob_length, key = FRAME.unpack_from(self.map, offset)
+        start = offset + FRAME.size
+        name = self.map[start:start + name_length].decode()
+        blob = self.map[start + name_length:start + name_length + blob_length]
+        return name, blob, key
+
+    def _find_frame(self, name):
+        """Повертає зміщення запису у файлі або None, якщо запису немає."""
+        target = name_hash(name)
+        i = self._lower_bound(NAME_ENTRY, self.index_offset, self.file_count, target)
+        while i < self.file_count:
+            entry_hash, offset = NAME_ENTRY.unpack_from(self.map, self.index_offset + i * NAME_ENTRY.size)
+            if entry_hash != target:
+                break
+            if self._read_frame(offset)[0] == name:
+                return offset
+            i += 1
+        return None
+
+    def _lower_bound(self, entry, start, count, key):
+        """Бінарний пошук першого елемента індексу з ключем не меншим за вказаний."""
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if entry.unpack_from(self.map, start + middle * entry.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+class IndexedAddressBook(AddressBook):
+    """
+    Клас IndexedAddressBook визначає книгу контактів, що завантажується з файлу з індексом.
+
+    Записи декодуються лише при зверненні до них, тому час запуску не залежить від розміру книги.
+
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.data = IndexedRecords(path, self)
+
+    def _find_by_birthday(self, month, day):
+        """Отримує імена контактів з днем народження у вказаний день у порядку книги."""
+        return self.data.find_birthdays(month, day)
+
+    def whois(self, value):
+        """Знаходить імена контактів, яким належить телефон або електронна адреса, у порядку книги."""
+        if '@' in value or self._owner_index is not None or not self.data.has_phone_index:
+            return super().whois(value)
+        # a phone is looked up in the snapshot index without decoding the whole book
+        return self.data.find_phone_owners(value)
+
+    def _index_record(self, record):
+        """Позначає запис зміненим і додає його до вже побудованих індексів."""
+        super()._index_record(record)
+        self.data.mark_changed(record.name.value)
+
+
+def write_indexed(path, book):
+    """
+    Записує книгу контактів у файл з індексом імен, номерів телефону та днів народження.
+
+    Незмінені записи книги, завантаженої з такого файлу, копіюються без декодування.
+
+    Args:
+        path (str): Шлях до файлу.
+        book (AddressBook): Книга контактів.
+    """
+    if isinstance(book.data, IndexedRecords):
+        frames = book.data.frames()
+    else:
+        frames = (
+            (name, pickle.dumps(record), record_birthday_key(record), record_phone_keys(record))
+            for name, record in book.data.items()
+        )
+
+    names = []
+    phones = []
+    birthdays = []
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, 0, 0, 0))
+        offset = HEADER.size
+        for name, blob, key, phone_keys in frames:
+            encoded_name = name.encode()
+            f.write(FRAME.pack(len(encoded_name), len(blob), key))
+            f.write(encoded_name)
+            f.write(blob)
+            names.append((name_hash(name), offset))
+            if key:
+                birthdays.append((key, offset))
+            phones.extend((phone, offset) for phone in phone_keys)
+            offset += FRAME.size + len(encoded_name) + len(blob)
+
+        index_offset = offset
+        names.sort()
+        f.write(b''.join(NAME_ENTRY.pack(*entry) for entry in names))
+
+        phones.sort()
+        f.write(b''.join(PHONE_ENTRY.pack(*entry) for entry in phones))
+
+        birthday_offset = index_offset + len(names) * NAME_ENTRY.size + len(phones) * PHONE_ENTRY.size
+        birthdays.sort()
+        f.write(b''.join(BIRTHDAY_ENTRY.pack(*entry) for entry in birthdays))
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, len(names), index_offset, birthday_offset))
+        f.flush()
+        os.fsync(f.fileno())
+
+    # Windows cannot replace a file that is still mapped, so the book is remapped from the new file
+    mapped = isinstance(book.data, IndexedRecords) and os.path.abspath(book.data.path) == os.path.abspath(path)
+    if mapped:
+        book.data.map.close()
+    try:
+        os.replace(temp_path, path)
+    except BaseException:
+        if mapped:
+            book.data.remap(saved=False)
+        raise
+    if mapped:
+        book.data.remap(saved=True)
+    fsync_directory(path)
+
+
+def fsync_directory(path):
+    """
+    Записує на диск каталог файлу, щоб перейменування файлу пережило збій.
+
+    Windows не дозволяє відкрити каталог як файл, тому там, як і в інших системах без
+    такої можливості, запис каталогу пропускається.
+    """
+    if os.name == 'nt':
+        return
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def recover_records(path):
+    """
+    Читає записи пошкодженого файлу з індексом до першого неповного чи пошкодженого запису.
+
+    Заголовок та індекси не використовуються, тому записи відновлюються, навіть якщо запис
+    файлу перервався до того, як їх було записано.
+
+    Args:
+        path (str): Шлях до файлу.
+
+    Returns:
+        list: Відновлені записи у порядку файлу.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    records = []
+    offset = HEADER.size
+    while offset + FRAME.size <= len(data):
+        name_length, blob_length, _ = FRAME.unpack_from(data, offset)
+        start = offset + FRAME.size + name_length
+        end = start + blob_length
+        if end > len(data):
+            break
+        try:
+            record = pickle.loads(data[start:end])
+        except Exception:
+            break
+        if not isinstance(record, Record):
+            # the name index that follows the records
+            break
+        records.append(record)
+        offset = end
+    return records
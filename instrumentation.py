@@ -0,0 +1,118 @@
+import math
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+
+# samples kept per command and metric; older samples are dropped first
+MAX_SAMPLES = 10_000
+METRICS = ['wall_seconds', 'cpu_seconds', 'allocated_bytes']
+PERCENTILES = [50, 95, 99]
+
+
+def percentile(values, p):
+    """
+    Повертає перцентиль значень методом найближчого рангу.
+
+    Args:
+        values (list): Значення.
+        p (int): Перцентиль від 0 до 100.
+
+    Returns:
+        float: Значення перцентиля або None для порожнього списку.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(p / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class CommandStats:
+    """
+    Клас CommandStats збирає час виконання та виділену пам'ять для кожної команди.
+
+    Збирання вмикається явно, тому без нього виконання команд нічим не сповільнюється.
+
+    Атрибути:
+        enabled (bool): Чи увімкнено збирання.
+        samples (dict): Відповідність назви команди словнику метрик зі списками вимірювань.
+
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.samples = defaultdict(lambda: {metric: deque(maxlen=MAX_SAMPLES) for metric in METRICS})
+
+    def enable(self):
+        """Вмикає збирання вимірювань та відстеження пам'яті."""
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.enabled = True
+
+    @contextmanager
+    def measure(self, name):
+        """Вимірює виконання команди з вказаною назвою, якщо збирання увімкнено."""
+        if not self.enabled:
+            yield
+            return
+
+        import tracemalloc
+
+        memory_before = tracemalloc.get_traced_memory()[0]
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            allocated = tracemalloc.get_traced_memory()[0] - memory_before
+            samples = self.samples[name]
+            samples['wall_seconds'].append(wall)
+            samples['cpu_seconds'].append(cpu)
+            samples['allocated_bytes'].append(allocated)
+
+    def summary(self):
+        """
+        Повертає кількість вимірювань та перцентилі кожної метрики для кожної команди.
+
+        Returns:
+            dict: Відповідність назви команди її підсумку.
+        """
+        result = {}
+        for name, samples in sorted(self.samples.items()):
+            result[name] = {'count': len(samples['wall_seconds'])}
+            for metric in METRICS:
+                values = list(samples[metric])
+                result[name][metric] = {f'p{p}': percentile(values, p) for p in PERCENTILES}
+        return result
+
+    def report(self):
+        """Повертає таблицю перцентилів часу та пам'яті для кожної команди."""
+        lines = [f"{'command':<20} {'count':>6} {'wall p50/p95/p99, ms':>26} {'cpu p50/p95/p99, ms':>26} {'alloc p50/p95/p99, KiB':>28}"]
+        for name, summary in self.summary().items():
+            wall = '/'.join(f"{summary['wall_seconds'][f'p{p}'] * 1000:.2f}" for p in PERCENTILES)
+            cpu = '/'.join(f"{summary['cpu_seconds'][f'p{p}'] * 1000:.2f}" for p in PERCENTILES)
+            alloc = '/'.join(f"{summary['allocated_bytes'][f'p{p}'] / 1024:.1f}" for p in PERCENTILES)
+            lines.append(f"{name:<20} {summary['count']:>6} {wall:>26} {cpu:>26} {alloc:>28}")
+        return '\n'.join(lines)
+
+    def dump(self, path):
+        """Записує підсумок та всі вимірювання у файл JSON."""
+        import json
+
+        data = {
+            'summary': self.summary(),
+            'samples': {
+                name: {metric: list(values) for metric, values in samples.items()}
+                for name, samples in sorted(self.samples.items())
+            },
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+command_stats = CommandStats()
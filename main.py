@@ -1,15 +1,20 @@
-import pickle
+import argparse
+import sys
+import time
+from collections.abc import Iterator
 from address_book import AddressBook, InvalidBirthDateFormatException, InvalidPhoneException, \
     Record, InvalidEmailException
 from notes_book import NotesBook, Note
-from prompt_toolkit import prompt
-from prompt_toolkit.completion import WordCompleter
-from prompt_toolkit import print_formatted_text, HTML
-from prompt_toolkit.formatted_text import FormattedText
+from storage import Autosaver, Journal, read_snapshot
+from commands import COMMANDS, command, command_names, find_command
+from instrumentation import command_stats
+from paging import PAGE_SIZE, parse_page_args, show_pages
 from colorama import init, Fore
 
 
-init()
+VERSION = '1.0'
+
+journal = Journal()
 
 def parse_input(user_input):
     """
@@ -237,6 +242,77 @@ def find_contact_validator(func):
     return inner
 
 
+def page_input_validator(func):
+    """
+    Декоратор, який перехоплює винятки ValueError, пов'язані з аргументами --limit та --offset.
+
+    Args:
+        func (callable): Функція для декорування.
+
+    Returns:
+        callable: Декорована функція.
+    """
+    def inner(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except ValueError as e:
+            return f"{Fore.BLUE}{e}"
+
+    return inner
+
+
+def contacts_file_validator(func):
+    """
+    Декоратор, який перехоплює винятки, пов'язані з файлами імпорту та експорту контактів.
+
+    Args:
+        func (callable): Функція для декорування.
+
+    Returns:
+        callable: Декорована функція.
+    """
+    def inner(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except IndexError:
+            return f"{Fore.BLUE}Give me file name please."
+        except ValueError as e:
+            return f"{Fore.RED}{e}"
+        except OSError as e:
+            return f"{Fore.RED}Cannot access file: {e}"
+
+    return inner
+
+
+def other_phone_owners(book, phone, name):
+    """
+    Знаходить інші контакти, яким уже належить номер телефону.
+
+    Args:
+        book (AddressBook): Екземпляр класу AddressBook, який містить контакти.
+        phone (str): Номер телефону.
+        name (str): Ім'я контакту, до якого додається номер.
+
+    Returns:
+        list: Імена інших власників номера.
+    """
+    return [owner for owner in book.whois(phone) if owner != name]
+
+
+def duplicate_phone_warning(phone, owners):
+    """Повертає попередження про номер телефону, що вже належить іншим контактам."""
+    if not owners:
+        return ''
+    return f"\n{Fore.YELLOW}Phone {phone} also belongs to {', '.join(owners)}."
+
+
+@command(
+    'add',
+    args='[name] [phone]',
+    help='Add a new contact with name and phone number.',
+    mutates=True,
+    book='contacts',
+)
 @add_contact_validator
 @base_input_validator
 def add_contact(args, book: AddressBook):
@@ -256,11 +332,13 @@ def add_contact(args, book: AddressBook):
     except KeyError:
         new_record = Record(name)
 
+    owners = other_phone_owners(book, phone, name)
     new_record.add_phone(phone)
     book.add_record(new_record)
-    return f"{Fore.GREEN}Contact has been added."
+    return f"{Fore.GREEN}Contact has been added." + duplicate_phone_warning(phone, owners)
 
 
+@command('delete-contact', args='[name]', help='Delete the entire contact record.', mutates=True, book='contacts')
 @base_input_validator
 def delete_contact(args, book: AddressBook):
     """
@@ -277,6 +355,13 @@ def delete_contact(args, book: AddressBook):
     return f"{Fore.GREEN}Contact has been deleted."
 
 
+@command(
+    'change-phone',
+    args='[name] [old phone] [new phone]',
+    help='Change the phone number for the specified contact from the old one to the new one.',
+    mutates=True,
+    book='contacts',
+)
 @change_phone_validator
 @base_input_validator
 def change_phone(args, book: AddressBook):
@@ -293,10 +378,18 @@ def change_phone(args, book: AddressBook):
     record = book.find(name)
     if record.find_phone(old_phone) is None:
         return f"{Fore.RED}No such phone."
+    owners = other_phone_owners(book, new_phone, name)
     record.edit_phone(old_phone, new_phone)
-    return f"{Fore.GREEN}Phone has been changed."
+    return f"{Fore.GREEN}Phone has been changed." + duplicate_phone_warning(new_phone, owners)
 
 
+@command(
+    'add-birthday',
+    args='[name] [birthdate]',
+    help='Add the birthdate for the specified contact.',
+    mutates=True,
+    book='contacts',
+)
 @add_birthday_validator
 @base_input_validator
 def add_birthday(args, book: AddressBook):
@@ -314,6 +407,7 @@ def add_birthday(args, book: AddressBook):
     return f"{Fore.GREEN}Birthday has been added."
 
 
+@command('show-birthday', args='[name]', help='Show the birthdate for the specified contact.', book='contacts')
 @base_input_validator
 def show_birthday(args, book: AddressBook):
     """
@@ -330,6 +424,13 @@ def show_birthday(args, book: AddressBook):
     return f"{Fore.YELLOW}{str(birthday)}" if birthday is not None else f"{Fore.RED}No birthday info."
 
 
+@command(
+    'add-email',
+    args='[name] [email]',
+    help='Add an email to the specified contact.',
+    mutates=True,
+    book='contacts',
+)
 @add_email_validator
 @base_input_validator
 def add_email(args, book: AddressBook):
@@ -347,6 +448,13 @@ def add_email(args, book: AddressBook):
     return f"{Fore.GREEN}Email has been added."
 
 
+@command(
+    'change-email',
+    args='[name] [old email] [new email]',
+    help='Change the email address for the specified contact from the old one to the new one.',
+    mutates=True,
+    book='contacts',
+)
 @change_email_validator
 @base_input_validator
 def change_email(args, book: AddressBook):
@@ -367,6 +475,7 @@ def change_email(args, book: AddressBook):
     return f"{Fore.GREEN}Email has been changed."
 
 
+@command('show-email', args='[name]', help='Show the email for the specified contact.', book='contacts')
 @base_input_validator
 def show_email(args, book: AddressBook):
     """
@@ -383,6 +492,20 @@ def show_email(args, book: AddressBook):
     return f"{Fore.YELLOW}{'; '.join(email.value for email in emails)}" if len(emails) > 0 else f"{Fore.RED}No email."
 
 
+@command(
+    'add-address',
+    args='[name] [address]',
+    help='Add an address, including country, city, street, and additional details.',
+    mutates=True,
+    book='contacts',
+)
+@command(
+    'change-address',
+    args='[name] [address]',
+    help='Change the address for the specified contact.',
+    mutates=True,
+    book='contacts',
+)
 @add_address_validator
 @base_input_validator
 def add_address(args, book: AddressBook):
@@ -406,6 +529,7 @@ def add_address(args, book: AddressBook):
     return f"{Fore.GREEN}Address has been changed." if had_address else f"{Fore.GREEN}Address has been added."
 
 
+@command('show-address', args='[name]', help='Show the address for the specified contact.', book='contacts')
 @base_input_validator
 def show_address(args, book: AddressBook):
     """
@@ -423,6 +547,7 @@ def show_address(args, book: AddressBook):
     return f"{Fore.YELLOW}{str(address)}" if address is not None else f"{Fore.RED}No address found."
 
 
+@command('phone', args='[name]', help='Show the phone number for the specified contact.', book='contacts')
 @base_input_validator
 def show_phones(args, book: AddressBook):
     """
@@ -439,19 +564,46 @@ def show_phones(args, book: AddressBook):
     return f"{Fore.YELLOW}{'; '.join(phone.value for phone in phones)}"
 
 
+@command('whois', args='[phone|email]', help='Show the contacts that own the phone number or email.', book='contacts')
+@find_contact_validator
+def whois(args, book: AddressBook):
+    """
+    Знаходить контакти, яким належить номер телефону або електронна адреса.
+
+    Args:
+        args (list): Список аргументів, включаючи номер телефону або електронну адресу.
+
+    Returns:
+        str: Знайдені контакти або повідомлення про відсутність результатів.
+    """
+    names = book.whois(args[0])
+    if not names:
+        return "No result."
+    return '\n'.join(f"{Fore.YELLOW}{str(book.find(name))}" for name in names)
+
+
+@command(
+    'find-contact',
+    args='[--prefix] [param]',
+    help='Display all contact records found by the specified parameter, or by name prefix with --prefix.',
+    book='contacts',
+)
 @find_contact_validator
 def find_contact(args, book: AddressBook):
     """
     Знаходить контакт за заданим словом.
 
     Args:
-        args (list): Список аргументів, включаючи слово для пошуку.
+        args (list): Список аргументів, включаючи слово для пошуку. З першим аргументом --prefix
+            знаходить контакти, ім'я яких починається з наступного аргументу, у порядку імен.
 
     Returns:
         str: Знайдений контакт або повідомлення про відсутність результатів.
     """
-    search_word = args[0]
-    result = book.search_contacts(search_word)
+    if args[0] == '--prefix':
+        result = book.find_by_prefix(args[1])
+    else:
+        result = book.search_contacts(args[0])
 
     if not result:
         return "No result."
@@ -459,23 +611,39 @@ def find_contact(args, book: AddressBook):
         return '\n'.join(f"{Fore.YELLOW}{str(record)}" for record in result)
 
 
+@command(
+    'all',
+    args='[--limit N] [--offset N]',
+    help='Show all contacts sorted by name, or N contacts after the offset.',
+    book='contacts',
+)
+@page_input_validator
 @base_input_validator
-def show_all(book: AddressBook):
+def show_all(args, book: AddressBook):
     """
     Виводить всі контакти з адресної книги.
 
     Args:
+    args (list): Необов'язкові аргументи --limit N та --offset N.
     book (AddressBook): Екземпляр класу AddressBook, який містить контакти.
 
     Returns:
-    str: Рядок з усіма контактами або повідомлення про їх відсутність.
+    Iterator: Генератор рядків контактів, які форматуються під час виведення,
+        або повідомлення про їх відсутність.
     """
+    offset, limit = parse_page_args(args)
     if (len(book) == 0):
         return "No contacts."
     else:
-        return '\n'.join(f"{Fore.YELLOW}{str(record)}" for record in book.values())
+        return (f"{Fore.YELLOW}{str(record)}" for record in book.iter_records(offset, limit, sort=True))
 
 
+@command(
+    'birthdays',
+    args='[days number]',
+    help='Show birthdays that will occur within the specified number of days (7 by default).',
+    book='contacts',
+)
 @birthdays_input_validator
 @base_input_validator
 def birthdays(args, book: AddressBook):
@@ -498,6 +666,61 @@ def birthdays(args, book: AddressBook):
             days_count = int(args[0])
         return f"{Fore.YELLOW}Birthdays during {days_count} day(s)\n" + book.get_birthdays_per_week(days_count)
 
+
+@command(
+    'import-contacts',
+    args='[file.csv|file.vcf]',
+    help='Import contacts from a CSV or vCard file; names become one word joined by _, invalid rows go to <file>.rejects.csv.',
+    mutates=True,
+    book='contacts',
+)
+@contacts_file_validator
+def import_contacts(args, book: AddressBook):
+    """
+    Імпортує контакти з CSV- або vCard-файлу.
+
+    Args:
+        args (list): Список аргументів, включаючи шлях до файлу.
+        book (AddressBook): Екземпляр класу AddressBook, який містить контакти.
+
+    Returns:
+        str: Кількість імпортованих та відхилених контактів.
+    """
+    path = args[0]
+    import contacts_io
+
+    imported, rejected = contacts_io.import_contacts(book, path)
+    result = f"{Fore.GREEN}Imported {imported} contact(s)."
+    if rejected:
+        result += f"\n{Fore.RED}Rejected {rejected} row(s), see {path}.rejects.csv."
+    return result
+
+
+@command(
+    'export-contacts',
+    args='[file.csv|file.vcf]',
+    help='Export all contacts to a CSV or vCard file.',
+    book='contacts',
+)
+@contacts_file_validator
+def export_contacts(args, book: AddressBook):
+    """
+    Експортує всі контакти у CSV- або vCard-файл.
+
+    Args:
+        args (list): Список аргументів, включаючи шлях до файлу.
+        book (AddressBook): Екземпляр класу AddressBook, який містить контакти.
+
+    Returns:
+        str: Кількість експортованих контактів.
+    """
+    path = args[0]
+    import contacts_io
+
+    count = contacts_io.export_contacts(book, path)
+    return f"{Fore.GREEN}Exported {count} contact(s) to {path}."
+
+
 def get_unique_cleaned_non_empty_tags(input_tags: str):
     """
     Повертає унікальні, очищені від зайвих пробілів та лапок теги.
@@ -530,6 +753,13 @@ def get_note_property(msg):
         else:
             return input_value
 
+@command(
+    'add-note',
+    args='[title]...[add description]...[add tags]',
+    help='Add a title, then add a description and tags using the terminal prompt.',
+    mutates=True,
+    book='notes',
+)
 @note_error
 def add_note(args, book: NotesBook):
     """
@@ -560,6 +790,7 @@ def add_note(args, book: NotesBook):
     return f"{Fore.GREEN}Note '{title}' has been added."
 
 
+@command('delete-note', args='[title]', help='Delete the note.', mutates=True, book='notes')
 @note_error
 def delete_note(args, book: NotesBook):
     """
@@ -580,6 +811,13 @@ def delete_note(args, book: NotesBook):
         return f"{Fore.RED}Note '{title}' has not been found."
 
 
+@command(
+    'change-note',
+    args='[title]...[description]...[tags]',
+    help='Change description and tags using terminal prompt.',
+    mutates=True,
+    book='notes',
+)
 @note_error
 def change_note(args, book: NotesBook):
     """
@@ -609,20 +847,32 @@ def change_note(args, book: NotesBook):
     else:
         return f"{Fore.RED}Note with title '{title}' was not found."
 
+@command(
+    'all-notes',
+    args='[--limit N] [--offset N]',
+    help='Show all notes, or N notes after the offset.',
+    book='notes',
+)
 @note_error
-def show_all_notes(book: NotesBook):
+def show_all_notes(args, book: NotesBook):
     """
     Показує всі нотатки.
 
     Args:
+        args (list): Необов'язкові аргументи --limit N та --offset N.
         book (NotesBook): Блокнот з нотатками.
 
     Returns:
-        str: Всі нотатки або повідомлення про їх відсутність.
+        Iterator: Генератор нотаток, які форматуються під час виведення,
+            або повідомлення про їх відсутність.
     """
-    book.print_all_notes()
+    offset, limit = parse_page_args(args)
+    if (len(book) == 0):
+        return f"{Fore.RED}No notes."
+    return (str(note) for note in book.iter_notes(offset, limit))
 
 
+@command('show-note', args='[title]', help='Show a note.', book='notes')
 @note_error
 def show_note(args, book: NotesBook):
     """
@@ -642,6 +892,13 @@ def show_note(args, book: NotesBook):
         return f"{Fore.RED}Note '{title}' has not been found."
 
 
+@command(
+    'add-tags',
+    args='[title] ... [tags]',
+    help='Add tags to a note using the terminal prompt.',
+    mutates=True,
+    book='notes',
+)
 @note_error
 def add_tags(args, book: NotesBook):
     """
@@ -668,6 +925,7 @@ def add_tags(args, book: NotesBook):
         return f"{Fore.RED}Note '{title}' has not been not found."
 
 
+@command('delete-tags', args='[title] ... [tags]', help='Delete the tag.', mutates=True, book='notes')
 @note_error
 def delete_tags(args, book: NotesBook):
     """
@@ -692,48 +950,108 @@ def delete_tags(args, book: NotesBook):
         return f"{Fore.RED}Note '{title}' has not been not found."
 
 
+@command(
+    'search-tags',
+    args='[--and|--or] [tags]',
+    help='Search notes having all (--and) or any (--or, default) of the tags.',
+    book='notes',
+)
 @note_error
 def search_tags(args, book: NotesBook):
     """
     Шукає нотатки за тегами у NotesBook.
 
     Args:
-        args (list): Список тегів для пошуку.
+        args (list): Список тегів для пошуку. Перший аргумент --and шукає нотатки з усіма тегами,
+            --or (за замовчуванням) - з будь-яким з них.
         book (NotesBook): Екземпляр класу NotesBook.
 
     Returns:
         None
     """
     tags = args
-    notes = book.find_notes_by_tags(tags)
-    if (notes is not None):
+    match_all = False
+    if (len(tags) > 0 and tags[0] in ["--and", "--or"]):
+        match_all = tags[0] == "--and"
+        tags = tags[1:]
+    notes = book.find_notes_by_tags(tags, match_all)
+    if notes:
         book.print_notes(notes)
     else:
         print(f"{Fore.RED}No notes with tags '{tags}' have been found.")
 
 
-def load_from_file():
+@command(
+    'search-notes',
+    args='[words]',
+    help='Search notes by words in the title and description, best matches first.',
+    book='notes',
+)
+@note_error
+def search_notes(args, book: NotesBook):
+    """
+    Шукає нотатки за словами із заголовку та опису.
+
+    Args:
+        args (list): Слова для пошуку; кожне слово також збігається зі словами, що з нього починаються.
+        book (NotesBook): Екземпляр класу NotesBook.
+
+    Returns:
+        None
+    """
+    query = " ".join(args)
+    if (query.strip() == ''):
+        print(f"{Fore.BLUE}Give me search words please.")
+        return
+    notes = book.search_notes(query)
+    if notes:
+        book.print_notes(notes)
+    else:
+        print(f"{Fore.RED}No notes matching '{query}' have been found.")
+
+
+def load_from_file(storage='pickle'):
     """
-    Завантажує адресну книгу та книгу нотаток з файлу.
+    Завантажує адресну книгу та книгу нотаток з останнього знімку та застосовує до них журнал змін.
+
+    Якщо знімку ще немає, книги порожні. Про пошкоджені знімки та відновлені з них записи
+    повідомляється у stderr.
+
+    Args:
+        storage (str): Сховище даних: 'pickle' (знімок і журнал), 'shared' (знімок і журнал,
+            з якими одночасно працюють кілька сеансів) або 'sqlite' (база даних SQLite).
 
     Returns:
         tuple: Кортеж, що містить екземпляри AddressBook та NotesBook, завантажені з файлу.
     """
-    try:
-        with open('address_book.pkl', 'rb') as f:
-            address_book = pickle.load(f)
-        with open('notes_book.pkl', 'rb') as f:
-            notes_book = pickle.load(f)
-    except:
-        address_book = AddressBook()
-        notes_book = NotesBook()
+    global journal
+    if storage == 'sqlite':
+        from sqlite_storage import open_sqlite_books
+
+        return open_sqlite_books()
+    if storage == 'shared':
+        from shared_storage import SharedJournal
+
+        journal = SharedJournal()
+        journal.open_session()
+
+    problems = []
+    address_book, notes_book = read_snapshot(problems)
+    for problem in problems:
+        print(f"{Fore.RED}{problem}", file=sys.stderr)
 
+    journal.replay(address_book, notes_book)
+    if problems:
+        # a fresh snapshot keeps the recovered records if the damaged files are deleted
+        journal.compact(address_book, notes_book)
     return address_book, notes_book
 
 
 def save_to_file(address_book, notes_book):
     """
-    Зберігає адресну книгу та книгу нотаток у файл.
+    Дописує зміни адресної книги та книги нотаток до журналу.
+
+    Повний знімок книг записується лише тоді, коли журнал стає завеликим.
 
     Args:
         address_book (AddressBook): Екземпляр класу AddressBook.
@@ -742,130 +1060,174 @@ def save_to_file(address_book, notes_book):
     Returns:
         None
     """
-    with open('address_book.pkl', 'wb') as f:
-        pickle.dump(address_book, f)
-    with open('notes_book.pkl', 'wb') as f:
-        pickle.dump(notes_book, f)
+    connection = getattr(address_book, 'connection', None)
+    if connection is not None:
+        # SQLite books share one connection
+        connection.commit()
+    else:
+        journal.append(address_book, notes_book)
+
+@command("hello", help="Show text 'How can I help you?'")
+def hello(args, address_book, notes_book):
+    """
+    Вітається з користувачем.
+
+    Returns:
+        str: Привітання.
+    """
+    return Fore.BLUE + "How can I help you?"
+
+
+@command('stats', help='Show p50/p95/p99 wall time, CPU time and allocations per command (needs --stats).')
+def stats(args, address_book, notes_book):
+    """
+    Показує перцентилі часу виконання та виділеної пам'яті для кожної команди.
+
+    Returns:
+        str: Таблиця перцентилів або повідомлення про вимкнене збирання.
+    """
+    if not command_stats.enabled:
+        return f"{Fore.BLUE}Command stats are off, start with --stats to collect them."
+    if not command_stats.samples:
+        return f"{Fore.BLUE}No commands have been measured yet."
+    return Fore.YELLOW + command_stats.report()
+
 
 def print_all_commands():
-    """ Друкує список команд та їх пояснення. """
-    commands = {
-        f"- add-address {Fore.LIGHTYELLOW_EX}[name] [address]:": "Add an address, including country, city, street, and additional details.",
-        f"- add-birthday {Fore.LIGHTYELLOW_EX}[name] [birthdate]:": "Add the birthdate for the specified contact.",
-        f"- add {Fore.LIGHTYELLOW_EX}[name] [phone]:": "Add a new contact with name and phone number.",
-        f"- add-email {Fore.LIGHTYELLOW_EX}[name] [email]:": "Add an email to the specified contact.",
-        f"- add-note {Fore.LIGHTYELLOW_EX}[title]...[add description]...[add tags]:": "Add a title, then add a description and tags using the terminal prompt.",
-        f"- add-tags {Fore.LIGHTYELLOW_EX}[title] ... [tags]:": "Add tags to a note using the terminal prompt.",
-        f"- birthdays {Fore.LIGHTYELLOW_EX}[days number]:": "Show birthdays that will occur within the specified number of days.",
-        f"- change-address {Fore.LIGHTYELLOW_EX}[name] [address]:": "Change the address for the specified contact.",
-        f"- change-email {Fore.LIGHTYELLOW_EX}[name] [old email] [new email]:": "Change the email address for the specified contact from the old one to the new one.",
-        f"- change-phone {Fore.LIGHTYELLOW_EX}[name] [old phone] [new phone]:": "Change the phone number for the specified contact from the old one to the new one.",
-        f"- change-note {Fore.LIGHTYELLOW_EX}[title]...[description]...[tags]:": "Change description and tags using terminal prompt.",
-        f"- delete-contact {Fore.LIGHTYELLOW_EX}[name]:": "Delete the entire contact record.",
-        f"- delete-note {Fore.LIGHTYELLOW_EX}[title]:": "Delete the note.",
-        f"- delete-tags {Fore.LIGHTYELLOW_EX}[title] ... [tags]:": "Delete the tag.",
-        f"- find-contact {Fore.LIGHTYELLOW_EX}[param]:": "Display all contact records found by the specified parameter.",
-        f"- phone {Fore.LIGHTYELLOW_EX}[name]:": "Show the phone number for the specified contact.",
-        f"- search-tags {Fore.LIGHTYELLOW_EX}[tags]:": "Search notes by tags.",
-        f"- show-address {Fore.LIGHTYELLOW_EX}[name]:": "Show the address for the specified contact.",
-        f"- show-birthday {Fore.LIGHTYELLOW_EX}[name]:": "Show the birthdate for the specified contact.",
-        f"- show-email {Fore.LIGHTYELLOW_EX}[name]:": "Show the email for the specified contact.",
-        f"- show-note {Fore.LIGHTYELLOW_EX}[title]:": "Show a note."
-    }
-
-    commands_without_params = {
-    "- all:": "Show all contacts in the address book.",
-    "- all-notes:": "Show all notes.",
-    "- birthdays:": "Show birthdays that will occur within 7 days.",
-    "- close or exit:": "Close the application.",
-    "- hello:": "Show text 'How can I help you?'"}
+    """ Друкує список команд та їх пояснення, побудований з реєстру команд. """
+    names = command_names()
+    commands = [COMMANDS[name] for name in names if name in COMMANDS]
 
     print(Fore.BLUE + "COMMAND LIST:")
-    for command, description in commands.items():
-        print(f"{Fore.LIGHTGREEN_EX}{command:<58} {Fore.WHITE}{'|':^1} {Fore.LIGHTBLUE_EX} {description}")
+    for entry in commands:
+        if entry.args:
+            usage = f"- {entry.name} {Fore.LIGHTYELLOW_EX}{entry.args}:"
+            print(f"{Fore.LIGHTGREEN_EX}{usage:<58} {Fore.WHITE}{'|':^1} {Fore.LIGHTBLUE_EX} {entry.help}")
+
+    for entry in commands:
+        if not entry.args:
+            print(f"{Fore.LIGHTGREEN_EX}{f'- {entry.name}:':<53} {Fore.WHITE}{'|':^1} {Fore.LIGHTBLUE_EX} {entry.help}")
+    print(f"{Fore.LIGHTGREEN_EX}{'- close or exit:':<53} {Fore.WHITE}{'|':^1} {Fore.LIGHTBLUE_EX} Close the application.")
+
+    for name in names:
+        if name not in COMMANDS:
+            print(f"{Fore.LIGHTGREEN_EX}{f'- {name}:':<53} {Fore.WHITE}{'|':^1} {Fore.LIGHTBLUE_EX} Provided by a plugin.")
+
+
+def is_mutating(command):
+    """
+    Перевіряє, чи змінює команда книги.
+
+    Args:
+        command (str): Назва команди.
 
-    for command, description in commands_without_params.items():
-        print(f"{Fore.LIGHTGREEN_EX}{command:<53} {Fore.WHITE}{'|':^1} {Fore.LIGHTBLUE_EX} {description}")
+    Returns:
+        bool: True, якщо команда існує і змінює книги.
+    """
+    entry = find_command(command)
+    return entry is not None and entry.mutates
 
 
-def handle_command(command, args, address_book, notes_book):
+def handle_command(command, args, address_book, notes_book, page_size=None):
     """
     Обробляє команди користувача та виконує відповідні дії з адресною книгою та книгою нотаток.
 
+    Команда знаходиться у реєстрі команд за назвою, а її результат, якщо він є, виводиться.
+    Результат-генератор виводиться по рядку, а з page_size - посторінково за запитом користувача.
+
     Args:
         command (str): Команда, яку потрібно виконати.
         args (list): Список аргументів, які передаються разом з командою.
         address_book (AddressBook): Екземпляр класу AddressBook, який містить контакти.
         notes_book (NotesBook): Екземпляр класу NotesBook, який містить нотатки.
+        page_size (int): Кількість рядків на сторінці або None, щоб вивести все одразу.
 
     Returns:
-        None
+        Command: Виконана команда або None, якщо команду не знайдено.
     """
-    if command == "hello":
-        print(Fore.BLUE + "How can I help you?")
-    elif command == "add":
-        print(add_contact(args, address_book))
-    elif command == "delete-contact":
-        print(delete_contact(args, address_book))
-    elif command == "change-phone":
-        print(change_phone(args, address_book))
-    elif command == "add-birthday":
-        print(add_birthday(args, address_book))
-    elif command == "show-birthday":
-        print(show_birthday(args, address_book))
-    elif command == "add-email":
-        print(add_email(args, address_book))
-    elif command == "show-email":
-        print(show_email(args, address_book))
-    elif command == "change-email":
-        print(change_email(args, address_book))
-    elif command in ["add-address", "change-address"]:
-        print(add_address(args, address_book))
-    elif command == "show-address":
-        print(show_address(args, address_book))
-    elif command == "phone":
-        print(show_phones(args, address_book))
-    elif command == "find-contact":
-        print(find_contact(args, address_book))
-    elif command == "all":
-        print(show_all(address_book))
-    elif command == "birthdays":
-        print(birthdays(args, address_book))
-    elif command == "add-note":
-        print(add_note(args, notes_book))
-    elif command == "change-note":
-        print(change_note(args, notes_book))
-    elif command == "show-note":
-        print(show_note(args, notes_book))
-    elif command == "add-tags":
-        print(add_tags(args, notes_book))
-    elif command == "delete-tags":
-        print(delete_tags(args, notes_book))
-    elif command == "search-tags":
-        search_tags(args, notes_book)
-    elif command == "delete-note":
-        print(delete_note(args, notes_book))
-    elif command == "all-notes":
-        show_all_notes(notes_book)
-    else:
+    entry = find_command(command)
+    if entry is None:
         print(Fore.RED + "Invalid command.")
+        return None
+
+    # lazily rendered results do their work while being printed
+    with command_stats.measure(entry.name):
+        result = entry.run(args, address_book, notes_book)
+        if isinstance(result, Iterator):
+            if page_size is not None:
+                show_pages(result, page_size)
+            else:
+                for line in result:
+                    print(line)
+        elif result is not None:
+            print(result)
+    return entry
+
+
+@command(
+    'profile',
+    args='[--collapsed] [command] [args]',
+    help='Run a command under cProfile (or collect collapsed stacks) and save the profile to a file.',
+    mutates=True,
+)
+def profile(args, address_book, notes_book):
+    """
+    Виконує команду під профайлером і записує профіль у файл.
+
+    Профілюється лише виконання вказаної команди через handle_command. Без --collapsed
+    записується файл cProfile 'profile-<команда>.prof', з --collapsed - згорнуті стеки
+    'profile-<команда>.folded' для побудови flamegraph.
 
+    Args:
+        args (list): Необов'язковий прапорець --collapsed, команда та її аргументи.
+        address_book (AddressBook): Екземпляр класу AddressBook, який містить контакти.
+        notes_book (NotesBook): Екземпляр класу NotesBook, який містить нотатки.
 
-def main():
+    Returns:
+        str: Шлях до файлу профілю та, для cProfile, найдовші функції.
     """
-    Головна функція, яка запускає бот-асистент.
+    collapsed = len(args) > 0 and args[0] == '--collapsed'
+    if collapsed:
+        args = args[1:]
+    if len(args) == 0:
+        return f"{Fore.BLUE}Give me the command to profile please."
+
+    import profiling
+
+    command, *command_args = parse_input(' '.join(args))
+    if find_command(command) is None or command == 'profile':
+        return f"{Fore.RED}Invalid command."
+
+    def run():
+        handle_command(command, command_args, address_book, notes_book)
+
+    if collapsed:
+        path = f'profile-{command}.folded'
+        profiling.collapsed_stacks_call(run, path)
+        return f"{Fore.GREEN}Collapsed stacks have been saved to {path}."
+
+    path = f'profile-{command}.prof'
+    summary = profiling.profile_call(run, path)
+    return f"{Fore.GREEN}Profile has been saved to {path}.\n{Fore.YELLOW}{summary}"
+
+
+def run_interactive(address_book, notes_book, autosave_interval=60):
+    """
+    Виводить привітання та запускає цикл обробки команд, введених користувачем.
 
-    Завантажує дані з файлів, виводить привітання та перевіряє наявність днів народження.
-    Запускає цикл обробки команд користувача до тих пір, поки не буде введено команду для виходу.
-    Після завершення роботи зберігає дані у файли.
+    Зміни кожної команди одразу дописуються до журналу, а фоновий потік раз на
+    autosave_interval секунд записує знімок змінених книг.
 
     Args:
-        None
+        address_book (AddressBook): Екземпляр класу AddressBook, який містить контакти.
+        notes_book (NotesBook): Екземпляр класу NotesBook, який містить нотатки.
+        autosave_interval (float): Інтервал фонового запису знімку у секундах (0 вимикає його).
 
     Returns:
         None
     """
-    address_book, notes_book = load_from_file()
+    from prompt_toolkit import prompt
+    from prompt_toolkit.completion import WordCompleter
 
     print(f"{Fore.BLUE}Welcome to the assistant bot!")
     birthdays_today = address_book.today_birthdays()
@@ -874,22 +1236,262 @@ def main():
         print(f"{Fore.MAGENTA}Greetings! There are birthdays in your Address Book today!\nDo not forget to congratulate {names}!")
     print_all_commands()
 
-    command_list = WordCompleter([
-    'add-address', 'add-birthday', 'add', 'add-email', 'add-note', 'add-tags', 'all', 'all-notes',
-    'birthdays', 'close', 'exit', 'change-address', 'change-email', 'change-phone', 'change-note',
-    'delete-contact', 'delete-note', 'delete-tags', 'find-contact', 'hello', 'phone', 'search-tags',
-    'show-address', 'show-birthday', 'show-email', 'show-note'])
+    command_list = WordCompleter(command_names() + ['close', 'exit'])
+    # long listings wait for the user between pages only on a terminal
+    page_size = PAGE_SIZE if sys.stdout.isatty() else None
 
-    while True:
-        user_input = prompt('Enter a command: ', completer=command_list)
-        command, *args = parse_input(user_input)
+    autosaver = Autosaver(journal, address_book, notes_book, autosave_interval)
+    # the SQLite database commits after every command by itself
+    if autosave_interval > 0 and getattr(address_book, 'connection', None) is None:
+        autosaver.start()
 
-        if command in ["close", "exit"]:
-            save_to_file(address_book, notes_book)
-            print(Fore.BLUE + "Good bye!")
-            break
+    try:
+        while True:
+            user_input = prompt('Enter a command: ', completer=command_list)
+            command, *args = parse_input(user_input)
+
+            if command in ["close", "exit"]:
+                autosaver.stop()
+                save_to_file(address_book, notes_book)
+                print(Fore.BLUE + "Good bye!")
+                break
+            else:
+                with autosaver.lock, journal.synchronized(address_book, notes_book, is_mutating(command)):
+                    entry = handle_command(command, args, address_book, notes_book, page_size)
+                    if entry is not None and entry.mutates:
+                        save_to_file(address_book, notes_book)
+                        autosaver.mark_dirty()
+    finally:
+        autosaver.stop()
+
+
+def run_batch(source, address_book, notes_book):
+    """
+    Виконує команди зі скрипту, по одній у рядку, і зберігає книги один раз наприкінці.
+
+    Порожні рядки та рядки, що починаються з '#', пропускаються. Команди, що запитують
+    додаткові дані (наприклад, add-note), читають їх з наступних рядків скрипту.
+    Кількість виконаних команд за секунду виводиться у stderr.
+
+    Args:
+        source (str): Шлях до файлу скрипту або '-' для читання зі стандартного вводу.
+        address_book (AddressBook): Екземпляр класу AddressBook, який містить контакти.
+        notes_book (NotesBook): Екземпляр класу NotesBook, який містить нотатки.
+
+    Returns:
+        int: Кількість виконаних команд.
+    """
+    script = sys.stdin if source == '-' else open(source, encoding='utf-8')
+    stdin = sys.stdin
+    # prompts of interactive commands read their answers from the script
+    sys.stdin = script
+    count = 0
+    start = time.perf_counter()
+    try:
+        for line in script:
+            line = line.strip()
+            if line == '' or line.startswith('#'):
+                continue
+            command, *args = parse_input(line)
+            if command in ["close", "exit"]:
+                break
+            with journal.synchronized(address_book, notes_book, is_mutating(command)):
+                handle_command(command, args, address_book, notes_book)
+            count += 1
+    finally:
+        sys.stdin = stdin
+        if script is not stdin:
+            script.close()
+        save_to_file(address_book, notes_book)
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0
+    print(f"Executed {count} commands in {elapsed:.3f} s ({rate:.0f} commands/s).", file=sys.stderr)
+    return count
+
+
+def run_single(command_line, address_book, notes_book):
+    """
+    Виконує одну команду, передану у командному рядку, і зберігає книги, якщо вона їх змінила.
+
+    Args:
+        command_line (list): Назва команди та її аргументи.
+        address_book (AddressBook): Екземпляр класу AddressBook, який містить контакти.
+        notes_book (NotesBook): Екземпляр класу NotesBook, який містить нотатки.
+
+    Returns:
+        int: Код завершення: 0 або 1, якщо команду не знайдено.
+    """
+    command, *args = parse_input(' '.join(command_line))
+    # the process exits after one search, so building the contact index would not pay off
+    address_book.build_search_index = False
+    with journal.synchronized(address_book, notes_book, is_mutating(command)):
+        entry = handle_command(command, args, address_book, notes_book)
+    if entry is None:
+        return 1
+    if entry.mutates:
+        save_to_file(address_book, notes_book)
+    return 0
+
+
+def run_daemon(address_book, notes_book, storage='pickle', autosave_interval=60):
+    """
+    Тримає книги у пам'яті та виконує команди, які надсилає 'info-cli <команда>', доки процес не перервуть.
+
+    Зміни кожної команди дописуються до журналу, як і в інтерактивному режимі, а після
+    зупинки демона записується новий знімок книг.
+
+    Args:
+        address_book (AddressBook): Екземпляр класу AddressBook, який містить контакти.
+        notes_book (NotesBook): Екземпляр класу NotesBook, який містить нотатки.
+        storage (str): Сховище даних, від якого залежить шлях до сокета.
+        autosave_interval (float): Інтервал фонового запису знімку у секундах (0 вимикає його).
+
+    Returns:
+        None
+    """
+    import daemon
+
+    autosaver = Autosaver(journal, address_book, notes_book, autosave_interval)
+    sqlite = getattr(address_book, 'connection', None) is not None
+    if autosave_interval > 0 and not sqlite:
+        autosaver.start()
+
+    def execute(command_line):
+        with autosaver.lock:
+            status = run_single(command_line, address_book, notes_book)
+            autosaver.mark_dirty()
+        return status
+
+    path = daemon.socket_path(storage)
+    print(f"{Fore.BLUE}Serving commands on {path}, press Ctrl+C to stop.", file=sys.stderr)
+    try:
+        daemon.serve(path, execute)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        autosaver.stop()
+        if not sqlite:
+            journal.compact(address_book, notes_book)
+
+
+def run_server(address, address_book, notes_book):
+    """
+    Обслуговує команди клієнтів за протоколом JSON-рядків через TCP або Unix-сокет, доки процес не перервуть.
+
+    Зміни команд, виконаних за одну ітерацію циклу подій, зберігаються разом, а після
+    зупинки сервера записується новий знімок книг.
+
+    Args:
+        address (str): 'unix:ШЛЯХ' для Unix-сокета, 'ХОСТ:ПОРТ' або 'ПОРТ' для TCP.
+        address_book (AddressBook): Екземпляр класу AddressBook, який містить контакти.
+        notes_book (NotesBook): Екземпляр класу NotesBook, який містить нотатки.
+
+    Returns:
+        None
+    """
+    import command_server
+
+    def execute(command, args):
+        with journal.synchronized(address_book, notes_book, is_mutating(command)):
+            return handle_command(command, args, address_book, notes_book)
+
+    try:
+        command_server.serve(address, execute, lambda: save_to_file(address_book, notes_book))
+    finally:
+        if getattr(address_book, 'connection', None) is None:
+            journal.compact(address_book, notes_book)
+
+
+def run_in_daemon(command_line, storage='pickle'):
+    """
+    Виконує одну команду у запущеному демоні, щоб не завантажувати книги з файлів.
+
+    Args:
+        command_line (list): Назва команди та її аргументи.
+        storage (str): Сховище даних, яке обслуговує демон.
+
+    Returns:
+        int: Код завершення команди або None, якщо демон не запущено.
+    """
+    import daemon
+
+    try:
+        return daemon.send_command(daemon.socket_path(storage), command_line)
+    except ConnectionError as e:
+        print(f"{Fore.RED}{e}", file=sys.stderr)
+        return 1
+
+
+def main():
+    """
+    Головна функція, яка запускає бот-асистент.
+
+    Завантажує дані з файлів і виконує одну команду з командного рядка, команди скрипту
+    (--batch), обслуговує команди як демон (--daemon) чи сервер (--serve) або запускає
+    інтерактивний цикл обробки команд. Одна команда виконується у запущеному демоні без
+    завантаження файлів. Після завершення роботи зберігає дані у файли, а з --stats-file
+    також записує вимірювання команд.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(prog='info-cli', description='Personal assistant for managing contacts and notes')
+    parser.add_argument('--storage', choices=['pickle', 'shared', 'sqlite'], default='pickle',
+                        help='where contacts and notes are stored; shared lets several sessions use '
+                             'the same files at once (default: pickle)')
+    parser.add_argument('--batch', metavar='FILE',
+                        help="run the commands from FILE ('-' for stdin) without the interactive prompt")
+    parser.add_argument('--autosave', metavar='SECONDS', type=float, default=60,
+                        help='write a snapshot of changed books every SECONDS in the background, 0 to disable (default: 60)')
+    parser.add_argument('--stats', action='store_true',
+                        help='measure wall time, CPU time and allocations of every command (see the stats command)')
+    parser.add_argument('--stats-file', metavar='FILE',
+                        help='measure commands like --stats and write the measurements to FILE as JSON on exit')
+    parser.add_argument('--daemon', action='store_true',
+                        help="keep the books loaded and serve 'info-cli <command>' over a Unix socket until interrupted")
+    parser.add_argument('--serve', metavar='ADDRESS',
+                        help='serve commands as line-delimited JSON over TCP (HOST:PORT) or a Unix socket (unix:PATH)')
+    parser.add_argument('--parallel-search', metavar='PROCESSES', type=int, nargs='?', const=0,
+                        help='search contacts in PROCESSES worker processes, one per CPU core if omitted')
+    parser.add_argument('--version', action='version', version=f'%(prog)s {VERSION}')
+    parser.add_argument('command', nargs=argparse.REMAINDER,
+                        help='run this single command with its arguments and exit, e.g. info-cli phone Olena')
+    options = parser.parse_args()
+
+    init()
+    if options.stats or options.stats_file is not None:
+        command_stats.enable()
+    elif options.command:
+        # a running daemon already has the books loaded
+        status = run_in_daemon(options.command, options.storage)
+        if status is not None:
+            sys.exit(status)
+
+    address_book, notes_book = load_from_file(options.storage)
+    if options.parallel_search is not None:
+        address_book.enable_parallel_search(options.parallel_search or None)
+
+    status = 0
+    try:
+        if options.command:
+            status = run_single(options.command, address_book, notes_book)
+        elif options.serve is not None:
+            run_server(options.serve, address_book, notes_book)
+        elif options.daemon:
+            run_daemon(address_book, notes_book, options.storage, options.autosave)
+        elif options.batch is not None:
+            run_batch(options.batch, address_book, notes_book)
         else:
-            handle_command(command, args, address_book, notes_book)
+            run_interactive(address_book, notes_book, options.autosave)
+    finally:
+        address_book.disable_parallel_search()
+        if options.stats_file is not None:
+            command_stats.dump(options.stats_file)
+    sys.exit(status)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,10 @@
-from collections import UserDict
-from address_book import Field  
-from colorama import init, Fore
-
-init()
+import bisect
+import math
+import re
+from collections import UserDict, defaultdict
+from itertools import islice
+from address_book import Field, track_changes
+from colorama import Fore
 
 
 class Title(Field):
@@ -13,6 +15,8 @@ class Title(Field):
         value (str): Значення заголовку.
 
     """
+    __slots__ = ()
+
     def __init__(self, value):
         super().__init__(value)      
 
@@ -24,6 +28,8 @@ class Description(Field):
         value (str): Значення опису.
 
     """
+    __slots__ = ()
+
     def __init__(self, value):
         super().__init__(value)  
 
@@ -44,6 +50,7 @@ class Note:
         self._title = Title(title)
         self._description = None
         self._tags = []
+        self._book = None
 
     @property
     def title(self):
@@ -51,6 +58,7 @@ class Note:
         return self._title
 
     @title.setter
+    @track_changes
     def title(self, value: str):
         """Встановлює нове значення для заголовка нотатки."""
         self._title.value = value
@@ -61,6 +69,7 @@ class Note:
         return self._description
 
     @description.setter
+    @track_changes
     def description(self, value: str):
         """Встановлює нове значення для опису нотатки."""
         self._description = Description(value)
@@ -71,15 +80,18 @@ class Note:
         return self._unique_non_empty_tags(self._tags)
 
     @tags.setter
+    @track_changes
     def tags(self, value: list):
         """Встановлює новий список тегів для нотатки."""
         self._tags = self._unique_non_empty_tags(value)
 
+    @track_changes
     def add_tags(self, tags: list):
         """Додає нові теги до нотатки."""
         for tag in tags:
             self._tags.append(tag)
 
+    @track_changes
     def delete_tags(self, tags):
         """Видаляє вказані теги з нотатки."""
         for tag in tags:
@@ -92,12 +104,139 @@ class Note:
         """Повертає унікальний список непорожніх тегів."""
         non_empty_tags = [tag for tag in tags if tag != '']
         return list(set(non_empty_tags))
-        
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the owning book re-attaches itself after unpickling
+        state.pop('_book', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._book = None
+
     def __repr__(self):
         head = "========================\n"
         return f"{Fore.WHITE}{head}{Fore.BLUE}title={self.title}\n{Fore.YELLOW}description={self.description if self.description else None}\ntags={self.tags}\n"
 
 
+class TagIndex:
+    """
+    Клас для представлення інвертованого індексу тегів книги нотаток.
+
+    Properties:
+        tags (dict): Відповідність тегу множині заголовків нотаток.
+
+    """
+    def __init__(self):
+        self.tags = defaultdict(set)
+
+    def add(self, title: str, note: Note):
+        """Додає теги нотатки до індексу."""
+        for tag in note.tags:
+            self.tags[tag].add(title)
+
+    def remove(self, title: str, note: Note):
+        """Видаляє теги нотатки з індексу."""
+        for tag in note.tags:
+            titles = self.tags[tag]
+            titles.discard(title)
+            if not titles:
+                del self.tags[tag]
+
+    def lookup(self, tags: list, match_all=False) -> set:
+        """Повертає заголовки нотаток з будь-яким (або з усіма) тегами зі списку."""
+        found = [self.tags.get(tag, set()) for tag in tags]
+        if not found:
+            return set()
+        return set.intersection(*found) if match_all else set().union(*found)
+
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def words(text: str) -> list:
+    """Розбиває текст на слова у нижньому регістрі."""
+    return WORD_PATTERN.findall(text.lower())
+
+
+def note_words(note: Note) -> list:
+    """Повертає слова заголовку та опису нотатки."""
+    description = note.description.value if note.description is not None else ''
+    return words(f"{note.title.value} {description}")
+
+
+class FullTextIndex:
+    """
+    Клас для представлення повнотекстового індексу заголовків та описів нотаток.
+
+    Нотатки ранжуються за формулою BM25, а кожне слово запиту також збігається
+    зі словами, що з нього починаються.
+
+    Properties:
+        postings (dict): Відповідність слова частоті його появи у кожній нотатці.
+        lengths (dict): Кількість слів у кожній нотатці.
+        vocabulary (list): Відсортований список усіх слів індексу.
+        generation (str): Ідентифікатор знімку книги, для якого збережено індекс.
+
+    """
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.lengths = {}
+        self.total_length = 0
+        self.vocabulary = []
+        self.generation = None
+
+    def add(self, title: str, note: Note):
+        """Додає слова нотатки до індексу."""
+        note_terms = note_words(note)
+        for term in note_terms:
+            frequencies = self.postings[term]
+            if not frequencies:
+                bisect.insort(self.vocabulary, term)
+            frequencies[title] = frequencies.get(title, 0) + 1
+        self.lengths[title] = len(note_terms)
+        self.total_length += len(note_terms)
+
+    def remove(self, title: str, note: Note):
+        """Видаляє слова нотатки з індексу."""
+        for term in set(note_words(note)):
+            frequencies = self.postings[term]
+            frequencies.pop(title, None)
+            if not frequencies:
+                del self.postings[term]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+        self.total_length -= self.lengths.pop(title, 0)
+
+    def search(self, query: str) -> list:
+        """Повертає пари заголовок та оцінка BM25, відсортовані за спаданням оцінки."""
+        if not self.lengths:
+            return []
+
+        average_length = self.total_length / len(self.lengths)
+        scores = defaultdict(float)
+        for query_term in set(words(query)):
+            for term in self._expand(query_term):
+                frequencies = self.postings[term]
+                idf = math.log(1 + (len(self.lengths) - len(frequencies) + 0.5) / (len(frequencies) + 0.5))
+                for title, frequency in frequencies.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.lengths[title] / average_length)
+                    scores[title] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+    def _expand(self, prefix: str) -> list:
+        """Повертає слова індексу, що починаються з префікса."""
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = start
+        while end < len(self.vocabulary) and self.vocabulary[end].startswith(prefix):
+            end += 1
+        return self.vocabulary[start:end]
+
+
 class NotesBook(UserDict):
     """
     Клас для представлення книги нотаток.
@@ -105,18 +244,68 @@ class NotesBook(UserDict):
     Клас унаслідований від класу UserDict.
 
     """
-    
+
+    def __init__(self, *args, **kwargs):
+        self._reset_indexes()
+        self._changes = {}
+        self.generation = None
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, title, note):
+        old_note = self.data.get(title)
+        readded = False
+        if old_note is not None:
+            self._unindex_record(old_note)
+            old_note._book = None
+        else:
+            # a title deleted and added again moves to the end of the book and of the changes
+            readded = self._changes.pop(title, None) is not None
+            if self._order is not None:
+                self._order[title] = self._next_position
+                self._next_position += 1
+        self.data[title] = note
+        note._book = self
+        self._index_record(note)
+        if readded:
+            self._changes[title] = True
+
+    def __delitem__(self, title):
+        note = self.data.pop(title)
+        self._unindex_record(note)
+        note._book = None
+        self._changes.pop(title, None)
+        self._changes[title] = False
+        if self._order is not None:
+            del self._order[title]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # indexes are rebuilt on first use after loading
+        for attribute in ['_tag_index', '_text_index', '_order', '_next_position', '_changes']:
+            del state[attribute]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset_indexes()
+        self._changes = {}
+        for note in self.data.values():
+            note._book = self
+
     def add_note(self, note: Note):
         """Додає нову нотатку до книги."""
-        self.data[note.title.value] = note
+        self[note.title.value] = note
 
     def edit_note(self, old_note: Note, title=None, description=None, tags=None) -> Note:
         """Редагує існуючу нотатку."""
         if old_note.title.value in self.data:
-            if title is not None:
-                old_note.title.value = title
+            if title is not None and title != old_note.title.value:
+                # keep the note stored under its current title
+                del self[old_note.title.value]
+                old_note.title = title
+                self[title] = old_note
             if description is not None:
-                old_note.description.value = description
+                old_note.description = description
             if tags is not None:
                 old_note.tags = tags
             return old_note
@@ -126,14 +315,36 @@ class NotesBook(UserDict):
     def delete_note(self, note: Note):
         """Видаляє існуючу нотатку."""
         if note.title.value in self.data:
-            del self.data[note.title.value]
+            del self[note.title.value]
         else:
             raise KeyError(f"{Fore.RED}Note '{note.title.value}' has not been not found.")
 
+    def pop_changes(self):
+        """
+        Повертає зміни з часу попереднього виклику: пари заголовок та нотатка (None для видалених).
+
+        Зміни йдуть у порядку додавання нотаток; перед нотаткою, яку видалили і додали знову,
+        повертається її видалення, тож застосовані по черзі вони відтворюють порядок книги.
+        """
+        changes = []
+        for title, readded in self._changes.items():
+            note = self.data.get(title)
+            if readded and note is not None:
+                changes.append((title, None))
+            changes.append((title, note))
+        self._changes.clear()
+        return changes
+
     def get_all_notes(self) -> list:
         """Повертає список всіх нотаток."""
         return list(self.data.values())
     
+    def iter_notes(self, offset=0, limit=None):
+        """Повертає нотатки книги по одній, пропускаючи перші offset нотаток без їх декодування."""
+        stop = None if limit is None else offset + limit
+        for title in islice(self.data, offset, stop):
+            yield self.data[title]
+
     def print_notes(self, notes: list):
         """Виводить всі нотатки зі списку."""
         for note in notes:
@@ -141,7 +352,57 @@ class NotesBook(UserDict):
     
     def print_all_notes(self) -> None:
         """Виводить всі нотатки."""
-        self.print_notes(self.data.values())
+        self.print_notes(self.iter_notes())
+
+    def _reset_indexes(self):
+        """Скидає індекси книги, щоб вони були побудовані при першому зверненні."""
+        self._tag_index = None
+        self._text_index = None
+        self._order = None
+        self._next_position = 0
+
+    def _get_tag_index(self) -> TagIndex:
+        """Повертає індекс тегів, будуючи його при першому зверненні."""
+        if self._tag_index is None:
+            index = TagIndex()
+            for title, note in self.data.items():
+                index.add(title, note)
+            self._tag_index = index
+        return self._tag_index
+
+    def get_text_index(self) -> FullTextIndex:
+        """Повертає повнотекстовий індекс, будуючи його при першому зверненні."""
+        if self._text_index is None:
+            index = FullTextIndex()
+            for title, note in self.data.items():
+                index.add(title, note)
+            self._text_index = index
+        return self._text_index
+
+    def attach_text_index(self, index: FullTextIndex):
+        """Використовує збережений повнотекстовий індекс, якщо він відповідає знімку книги."""
+        if index.generation is not None and index.generation == getattr(self, 'generation', None):
+            self._text_index = index
+
+    def _get_order(self) -> dict:
+        """Повертає порядкові номери нотаток, будуючи їх при першому зверненні."""
+        if self._order is None:
+            self._order = {title: position for position, title in enumerate(self.data)}
+            self._next_position = len(self._order)
+        return self._order
+
+    def _index_record(self, note: Note):
+        """Позначає нотатку зміненою і додає її до вже побудованих індексів."""
+        self._changes.setdefault(note.title.value, False)
+        for index in (self._tag_index, self._text_index):
+            if index is not None:
+                index.add(note.title.value, note)
+
+    def _unindex_record(self, note: Note):
+        """Видаляє нотатку з уже побудованих індексів."""
+        for index in (self._tag_index, self._text_index):
+            if index is not None:
+                index.remove(note.title.value, note)
 
     def find_note_by_title(self, title: str) -> Note:
         """Пошук нотатки за заголовком."""
@@ -150,14 +411,15 @@ class NotesBook(UserDict):
         else:
             return None
 
-    def find_notes_by_tags(self, tags: list) -> list:
-        """Пошук нотаток за тегами."""
+    def find_notes_by_tags(self, tags: list, match_all=False) -> list:
+        """Пошук нотаток з будь-яким тегом зі списку або, якщо match_all, з усіма тегами."""
         cleaned_tags = [tag.strip('\'"') for tag in tags]
-        found_notes = []
-        for note in self.data.values():
-            if any(cleaned_tag in note.tags for cleaned_tag in cleaned_tags):
-                found_notes.append(note)
-        return found_notes
+        titles = self._get_tag_index().lookup(cleaned_tags, match_all)
+        return [self.data[title] for title in sorted(titles, key=self._get_order().__getitem__)]
+
+    def search_notes(self, query: str, limit=20) -> list:
+        """Повнотекстовий пошук нотаток за заголовком та описом, найрелевантніші першими."""
+        return [self.data[title] for title, _ in self.get_text_index().search(query)[:limit]]
 
     def sort_notes_by_tags(self, notes, tags=None):
         """Сортує нотатки за тегами."""
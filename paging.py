@@ -0,0 +1,49 @@
+from itertools import islice
+
+
+# lines shown per screen by the interactive pager
+PAGE_SIZE = 20
+PAGE_OPTIONS = ['--limit', '--offset']
+
+
+def parse_page_args(args):
+    """
+    Розбирає аргументи --limit N та --offset N.
+
+    Args:
+        args (list): Список аргументів команди.
+
+    Returns:
+        tuple: Зміщення (0 за замовчуванням) та кількість записів (None - усі записи).
+    """
+    options = {'--offset': 0, '--limit': None}
+    for i in range(0, len(args), 2):
+        if args[i] not in PAGE_OPTIONS or i + 1 >= len(args) or not args[i + 1].isdigit():
+            raise ValueError("Use --limit N and --offset N with a whole number N.")
+        options[args[i]] = int(args[i + 1])
+    return options['--offset'], options['--limit']
+
+
+def show_pages(lines, page_size=PAGE_SIZE, ask=input):
+    """
+    Виводить рядки посторінково, форматуючи наступну сторінку лише після запиту користувача.
+
+    Args:
+        lines (iterable): Рядки для виведення, наприклад генератор.
+        page_size (int): Кількість рядків на сторінці.
+        ask (callable): Функція, що запитує користувача, чи показувати наступну сторінку.
+    """
+    lines = iter(lines)
+    next_line = next(lines, None)
+    while next_line is not None:
+        for line in [next_line, *islice(lines, page_size - 1)]:
+            print(line)
+        next_line = next(lines, None)
+        if next_line is None:
+            break
+        try:
+            answer = ask("-- More: Enter for the next page, q to stop -- ")
+        except EOFError:
+            break
+        if answer.strip().lower() == 'q':
+            break
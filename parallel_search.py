@@ -0,0 +1,125 @@
+import multiprocessing
+import os
+from address_book import AddressBook
+
+
+class ParallelSearch:
+    """
+    Клас ParallelSearch визначає пошук контактів, розподілений між кількома процесами.
+
+    Контакти книги діляться на частини, і кожен процес отримує свою частину лише один раз,
+    при першому пошуку, а далі тримає її у пам'яті разом з власним індексом. Зміни книги
+    накопичуються і надсилаються процесам разом з наступним запитом, тож між запитами
+    записи не передаються повторно.
+
+    Атрибути:
+        book (AddressBook): Книга контактів, у якій виконується пошук.
+        processes (int): Кількість процесів.
+        connections (list): З'єднання з процесами або None, поки процеси не запущено.
+        shard_of (dict): Відповідність імені контакту номеру процесу, що його зберігає.
+        pending (list): Незастосовані зміни для кожного процесу: ім'я - запис або None для видалення.
+
+    """
+
+    def __init__(self, book, processes=None):
+        self.book = book
+        self.processes = processes or os.cpu_count() or 1
+        self.connections = None
+        self.shard_of = {}
+        self.pending = []
+        self._workers = []
+        self._next_shard = 0
+
+    def add(self, name, record):
+        """Запам'ятовує новий або змінений запис для процесу, що його зберігає."""
+        if self.connections is None:
+            return
+        shard = self.shard_of.get(name)
+        if shard is None:
+            shard = self.shard_of[name] = self._next_shard
+            self._next_shard = (self._next_shard + 1) % self.processes
+        self.pending[shard][name] = record
+
+    def remove(self, name, record):
+        """Запам'ятовує видалення запису; змінений запис потім знову додається тим самим методом add."""
+        if self.connections is None:
+            return
+        self.pending[self.shard_of[name]][name] = None
+
+    def search(self, word):
+        """
+        Шукає слово в усіх частинах книги одночасно.
+
+        Args:
+            word (str): Слово для пошуку у нижньому регістрі.
+
+        Returns:
+            list: Імена знайдених контактів без певного порядку.
+        """
+        if self.connections is None:
+            self._start()
+
+        for connection, updates in zip(self.connections, self.pending):
+            connection.send((updates, word))
+        for updates in self.pending:
+            for name, record in updates.items():
+                if record is None:
+                    del self.shard_of[name]
+        self.pending = [{} for _ in range(self.processes)]
+
+        names = []
+        for connection in self.connections:
+            names.extend(connection.recv())
+        return names
+
+    def close(self):
+        """Зупиняє процеси пошуку."""
+        if self.connections is None:
+            return
+        for connection in self.connections:
+            connection.send(None)
+            connection.close()
+        for worker in self._workers:
+            worker.join()
+        self.connections = None
+        self._workers = []
+
+    def _start(self):
+        """Ділить книгу на частини та запускає процес для кожної з них."""
+        items = list(self.book.data.items())
+        size = -(-len(items) // self.processes)
+        self.connections = []
+        for shard in range(self.processes):
+            records = items[shard * size:(shard + 1) * size]
+            for name, _ in records:
+                self.shard_of[name] = shard
+            connection, worker_connection = multiprocessing.Pipe()
+            # with fork the records are inherited, otherwise they are pickled once here
+            worker = multiprocessing.Process(target=_serve_shard, args=(worker_connection, records), daemon=True)
+            worker.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self._workers.append(worker)
+        self.pending = [{} for _ in range(self.processes)]
+
+
+def _serve_shard(connection, records):
+    """Тримає частину книги у пам'яті та відповідає на запити пошуку, доки не отримає None."""
+    shard = AddressBook()
+    for name, record in records:
+        shard[name] = record
+    del records
+
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        updates, word = message
+        for name, record in updates.items():
+            if record is not None:
+                shard[name] = record
+            elif name in shard.data:
+                del shard[name]
+        # changes of the shard are never saved
+        shard.pop_changes()
+        connection.send([record.name.value for record in shard.search_contacts(word)])
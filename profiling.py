@@ -0,0 +1,77 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import time
+from collections import defaultdict
+
+
+def profile_call(func, path, top=15):
+    """
+    Виконує функцію під cProfile і записує результат у файл.
+
+    Args:
+        func (callable): Функція без аргументів.
+        path (str): Шлях до файлу, який читають pstats, snakeviz та подібні інструменти.
+        top (int): Кількість функцій у підсумку.
+
+    Returns:
+        str: Функції з найбільшим сукупним часом.
+    """
+    profiler = cProfile.Profile()
+    profiler.runcall(func)
+    profiler.dump_stats(path)
+
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(top)
+    return output.getvalue()
+
+
+def collapsed_stacks_call(func, path):
+    """
+    Виконує функцію, записуючи час кожного стеку викликів у згорнутому форматі.
+
+    Кожен рядок файлу містить стек викликів, розділений ';', та власний час стеку
+    у мікросекундах, як очікують flamegraph.pl, speedscope та подібні інструменти.
+
+    Args:
+        func (callable): Функція без аргументів.
+        path (str): Шлях до файлу.
+
+    Returns:
+        int: Кількість різних стеків.
+    """
+    stack = []
+    totals = defaultdict(int)
+    last = [time.perf_counter_ns()]
+
+    def tracer(frame, event, arg):
+        now = time.perf_counter_ns()
+        if stack:
+            totals[tuple(stack)] += now - last[0]
+        if event == 'call':
+            stack.append(_code_label(frame.f_code))
+        elif event == 'c_call':
+            stack.append(f"{getattr(arg, '__module__', None) or 'builtins'}:{arg.__qualname__}")
+        elif stack:
+            # return, c_return and c_exception
+            stack.pop()
+        last[0] = time.perf_counter_ns()
+
+    sys.setprofile(tracer)
+    try:
+        func()
+    finally:
+        sys.setprofile(None)
+
+    with open(path, 'w') as f:
+        for frames, nanoseconds in totals.items():
+            if nanoseconds >= 1000:
+                f.write(f"{';'.join(frames)} {nanoseconds // 1000}\n")
+    return len(totals)
+
+
+def _code_label(code):
+    """Повертає назву функції разом з файлом, у якому її визначено."""
+    return f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
@@ -0,0 +1,149 @@
+import fcntl
+import io
+import os
+import pickle
+from contextlib import contextmanager
+from storage import JOURNAL_FILE, Journal, apply_changes
+
+
+# writers hold this lock exclusively while a command changes the books
+LOCK_FILE = 'info_cli.lock'
+# every open session holds this lock shared, so a session can tell whether it is the only one
+SESSIONS_FILE = 'info_cli.sessions'
+
+
+class SharedJournal(Journal):
+    """
+    Клас SharedJournal визначає журнал змін, з яким одночасно працюють кілька сеансів.
+
+    Версією книг сеансу є зміщення у журналі, до якого він застосував записи. Перед кожною
+    командою сеанс застосовує лише записи, дописані іншими сеансами після цього зміщення,
+    тож команди, що лише читають книги, ніколи не чекають на записувачів. Команди, що
+    змінюють книги, виконуються по одній під замком записувачів і дописують свої зміни,
+    поки тримають його, тому зміни одного сеансу не затирають змін іншого.
+
+    Журнал стискається у знімок лише тоді, коли інших сеансів немає, адже інакше вони
+    втратили б записи, які ще не застосували.
+
+    Атрибути:
+        path (str): Шлях до файлу журналу.
+        compact_threshold (int): Кількість записів, після якої журнал стискається.
+        entries (int): Кількість записів у журналі.
+        offset (int): Зміщення у журналі, до якого записи застосовано до книг сеансу.
+        writing (bool): Чи тримає сеанс замок записувачів.
+
+    """
+
+    def __init__(self, path=JOURNAL_FILE, compact_threshold=1000, lock_path=LOCK_FILE, sessions_path=SESSIONS_FILE):
+        super().__init__(path, compact_threshold)
+        self.offset = 0
+        self.writing = False
+        self._lock = open(lock_path, 'ab')
+        self._sessions = open(sessions_path, 'ab')
+
+    def open_session(self):
+        """
+        Реєструє сеанс перед читанням знімку.
+
+        Чекає лише тоді, коли інший сеанс саме стискає журнал у новий знімок.
+        """
+        fcntl.flock(self._sessions, fcntl.LOCK_SH)
+
+    def replay(self, address_book, notes_book):
+        """
+        Застосовує до книг записи журналу, дописані після зміщення offset.
+
+        Запис, який інший сеанс ще дописує, пропускається до наступного виклику. Обрізаний
+        збоєм запис видаляється лише під замком записувачів, коли дописувати нікому.
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        stream = io.BytesIO(data)
+        end = 0
+        while stream.tell() < len(data):
+            try:
+                changes = pickle.load(stream)
+            except Exception:
+                if self.writing:
+                    with open(self.path, 'r+b') as f:
+                        f.truncate(self.offset + end)
+                break
+            apply_changes(changes, address_book, notes_book)
+            self.entries += 1
+            end = stream.tell()
+        self.offset += end
+
+        # replayed changes are already on disk
+        address_book.pop_changes()
+        notes_book.pop_changes()
+
+    def compact(self, address_book, notes_book):
+        """Записує новий знімок книг та очищує журнал, якщо інших сеансів немає."""
+        with self._writer_lock():
+            self.replay(address_book, notes_book)
+            try:
+                fcntl.flock(self._sessions, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # converting a flock lock may drop the shared lock on failure
+                fcntl.flock(self._sessions, fcntl.LOCK_SH)
+                return
+            try:
+                super().compact(address_book, notes_book)
+                self.offset = 0
+            finally:
+                fcntl.flock(self._sessions, fcntl.LOCK_SH)
+
+    @contextmanager
+    def synchronized(self, address_book, notes_book, write=False):
+        """
+        Застосовує зміни інших сеансів перед командою.
+
+        Команда, що змінює книги, виконується під замком записувачів, а її зміни
+        дописуються до журналу до того, як замок буде відпущено.
+
+        Args:
+            address_book (AddressBook): Екземпляр класу AddressBook.
+            notes_book (NotesBook): Екземпляр класу NotesBook.
+            write (bool): Чи змінює команда книги.
+        """
+        if not write:
+            self.replay(address_book, notes_book)
+            yield
+            return
+
+        with self._writer_lock():
+            self.replay(address_book, notes_book)
+            yield
+            self.append(address_book, notes_book)
+
+    def _write(self, changes):
+        """Дописує запис до журналу під замком записувачів і пересуває зміщення за нього."""
+        with self._writer_lock():
+            with open(self.path, 'ab') as f:
+                start = f.tell()
+                pickle.dump(changes, f)
+                f.flush()
+                os.fsync(f.fileno())
+                # entries of other sessions before this one are replayed with it later
+                if start == self.offset:
+                    self.offset = f.tell()
+
+    @contextmanager
+    def _writer_lock(self):
+        """Тримає замок записувачів; повторний вхід у тому ж сеансі нічого не робить."""
+        if self.writing:
+            yield
+            return
+
+        fcntl.flock(self._lock, fcntl.LOCK_EX)
+        self.writing = True
+        try:
+            yield
+        finally:
+            self.writing = False
+            fcntl.flock(self._lock, fcntl.LOCK_UN)
@@ -0,0 +1,388 @@
+import pickle
+import sqlite3
+from collections.abc import MutableMapping
+from address_book import AddressBook, normalize_phone
+from notes_book import NotesBook, words
+
+
+DATABASE_FILE = 'info_cli.db'
+
+# created once the name_key column exists, which older databases get in open_sqlite_books
+NAME_KEY_INDEX = 'CREATE INDEX IF NOT EXISTS contacts_name_key ON contacts (name_key, name)'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    name_key TEXT NOT NULL,
+    birth_month INTEGER,
+    birth_day INTEGER,
+    search_text TEXT NOT NULL,
+    record BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contacts_birthday ON contacts (birth_month, birth_day);
+
+CREATE TABLE IF NOT EXISTS phones (name TEXT NOT NULL, phone TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS phones_name ON phones (name);
+CREATE INDEX IF NOT EXISTS phones_phone ON phones (phone);
+
+CREATE TABLE IF NOT EXISTS emails (name TEXT NOT NULL, email TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS emails_name ON emails (name);
+CREATE INDEX IF NOT EXISTS emails_email ON emails (email);
+
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL UNIQUE,
+    note BLOB NOT NULL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_text USING fts5 (title, description);
+
+CREATE TABLE IF NOT EXISTS tags (title TEXT NOT NULL, tag TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS tags_title ON tags (title);
+CREATE INDEX IF NOT EXISTS tags_tag ON tags (tag);
+'''
+
+
+def name_key(name):
+    """
+    Повертає ключ імені для пошуку та сортування без урахування регістру.
+
+    Вбудована функція SQLite lower() змінює регістр лише латинських літер, тому ключ
+    обчислюється у Python так само, як у книзі в пам'яті.
+    """
+    return name.lower()
+
+
+class SqliteTable(MutableMapping):
+    """
+    Клас SqliteTable визначає словник, що зберігає об'єкти книги у таблиці SQLite.
+
+    Об'єкти зберігаються у стовпці BLOB, а порядок ітерації збігається з порядком додавання.
+    Запис об'єкта (__setitem__) залишається абстрактним методом MutableMapping і визначається
+    підкласами для кожної таблиці.
+
+    Атрибути:
+        connection (sqlite3.Connection): З'єднання з базою даних.
+        book (UserDict): Книга, якій належать об'єкти.
+
+    """
+
+    table = None
+    key_column = None
+    value_column = None
+
+    def __init__(self, connection, book):
+        self.connection = connection
+        self.book = book
+
+    def __getitem__(self, key):
+        row = self.connection.execute(
+            f'SELECT {self.value_column} FROM {self.table} WHERE {self.key_column} = ?',
+            (key,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return self.decode(row[0])
+
+    def __delitem__(self, key):
+        cursor = self.connection.execute(f'DELETE FROM {self.table} WHERE {self.key_column} = ?', (key,))
+        if cursor.rowcount == 0:
+            raise KeyError(key)
+        self.delete_details(key)
+
+    def __contains__(self, key):
+        return self.connection.execute(
+            f'SELECT 1 FROM {self.table} WHERE {self.key_column} = ?',
+            (key,),
+        ).fetchone() is not None
+
+    def __iter__(self):
+        for row in self.connection.execute(f'SELECT {self.key_column} FROM {self.table} ORDER BY id'):
+            yield row[0]
+
+    def __len__(self):
+        return self.connection.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+    def values(self):
+        """Повертає всі об'єкти таблиці одним запитом."""
+        return self.select('ORDER BY id')
+
+    def items(self):
+        """Повертає всі пари ключ та об'єкт таблиці одним запитом."""
+        return ((getattr(value, self.key_column).value, value) for value in self.values())
+
+    def select(self, condition, params=()):
+        """Повертає об'єкти, що задовольняють умову SQL."""
+        rows = self.connection.execute(
+            f'SELECT {self.value_column} FROM {self.table} {condition}',
+            params,
+        ).fetchall()
+        return [self.decode(row[0]) for row in rows]
+
+    def select_keys(self, condition, params=()):
+        """Повертає ключі об'єктів, що задовольняють умову SQL."""
+        rows = self.connection.execute(
+            f'SELECT {self.key_column} FROM {self.table} {condition}',
+            params,
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def decode(self, blob):
+        """Відновлює об'єкт зі стовпця BLOB і прив'язує його до книги."""
+        value = pickle.loads(blob)
+        value._book = self.book
+        return value
+
+    def delete_details(self, key):
+        """Видаляє рядки допоміжних таблиць для ключа."""
+        pass
+
+
+class SqliteContacts(SqliteTable):
+    """Клас SqliteContacts зберігає записи контактів у таблиці contacts."""
+
+    table = 'contacts'
+    key_column = 'name'
+    value_column = 'record'
+
+    def __setitem__(self, name, record):
+        birthday = record.birthday.value if record.birthday is not None else None
+        self.connection.execute(
+            '''INSERT INTO contacts (name, name_key, birth_month, birth_day, search_text, record)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (name) DO UPDATE SET
+                birth_month = excluded.birth_month,
+                birth_day = excluded.birth_day,
+                search_text = excluded.search_text,
+                record = excluded.record''',
+            (
+                name,
+                name_key(name),
+                birthday.month if birthday is not None else None,
+                birthday.day if birthday is not None else None,
+                record.search_text(),
+                pickle.dumps(record),
+            ),
+        )
+        self.delete_details(name)
+        # stored in the form whois looks them up
+        self.connection.executemany(
+            'INSERT INTO phones (name, phone) VALUES (?, ?)',
+            [(name, normalize_phone(phone.value)) for phone in record.phones],
+        )
+        self.connection.executemany(
+            'INSERT INTO emails (name, email) VALUES (?, ?)',
+            [(name, email.value.lower()) for email in record.emails],
+        )
+
+    def delete_details(self, name):
+        self.connection.execute('DELETE FROM phones WHERE name = ?', (name,))
+        self.connection.execute('DELETE FROM emails WHERE name = ?', (name,))
+
+
+class SqliteNotes(SqliteTable):
+    """Клас SqliteNotes зберігає нотатки у таблиці notes."""
+
+    table = 'notes'
+    key_column = 'title'
+    value_column = 'note'
+
+    def __setitem__(self, title, note):
+        self.connection.execute(
+            '''INSERT INTO notes (title, note) VALUES (?, ?)
+            ON CONFLICT (title) DO UPDATE SET note = excluded.note''',
+            (title, pickle.dumps(note)),
+        )
+        note_id = self.connection.execute('SELECT id FROM notes WHERE title = ?', (title,)).fetchone()[0]
+        self.connection.execute('DELETE FROM notes_text WHERE rowid = ?', (note_id,))
+        self.connection.execute(
+            'INSERT INTO notes_text (rowid, title, description) VALUES (?, ?, ?)',
+            (note_id, title, note.description.value if note.description is not None else ''),
+        )
+        self.delete_details(title)
+        self.connection.executemany(
+            'INSERT INTO tags (title, tag) VALUES (?, ?)',
+            [(title, tag) for tag in note.tags],
+        )
+
+    def __delitem__(self, title):
+        self.connection.execute('DELETE FROM notes_text WHERE rowid = (SELECT id FROM notes WHERE title = ?)', (title,))
+        super().__delitem__(title)
+
+    def delete_details(self, title):
+        self.connection.execute('DELETE FROM tags WHERE title = ?', (title,))
+
+
+class SqliteAddressBook(AddressBook):
+    """
+    Клас SqliteAddressBook визначає книгу контактів, що зберігається у базі даних SQLite.
+
+    Пошук за іменем, текстом та днем народження виконується запитами до бази даних.
+
+    """
+
+    def __init__(self, connection):
+        super().__init__()
+        self.connection = connection
+        self.data = SqliteContacts(connection, self)
+
+    def __setitem__(self, name, record):
+        record._book = self
+        self.data[name] = record
+
+    def __delitem__(self, name):
+        del self.data[name]
+
+    def values(self):
+        return self.data.values()
+
+    def items(self):
+        return self.data.items()
+
+    def pop_changes(self):
+        """Повертає порожній список: зміни одразу записуються до бази даних."""
+        return []
+
+    def search_contacts(self, search_word):
+        """Шукає контакти за вказаним словом."""
+        return self.data.select('WHERE instr(search_text, ?) > 0 ORDER BY id', (search_word.lower(),))
+
+    def iter_records(self, offset=0, limit=None, sort=False):
+        """Повертає записи книги по одному, пропускаючи перші offset записів на боці бази даних."""
+        order = 'name_key, name' if sort else 'id'
+        rows = self.connection.execute(
+            f'SELECT record FROM contacts ORDER BY {order} LIMIT ? OFFSET ?',
+            (-1 if limit is None else limit, offset),
+        )
+        for row in rows:
+            yield self.data.decode(row[0])
+
+    def find_by_prefix(self, prefix):
+        """Знаходить контакти, ім'я яких починається з prefix без урахування регістру, за іменем."""
+        # every name with the prefix sorts below the prefix followed by the largest code point
+        return self.find_in_range(prefix, prefix + '\U0010ffff')
+
+    def find_in_range(self, start, stop=None):
+        """Знаходить контакти з іменами від start (включно) до stop без урахування регістру, за іменем."""
+        if stop is None:
+            return self.data.select('WHERE name_key >= ? ORDER BY name_key, name', (name_key(start),))
+        return self.data.select(
+            'WHERE name_key >= ? AND name_key < ? ORDER BY name_key, name',
+            (name_key(start), name_key(stop)),
+        )
+
+    def whois(self, value):
+        """Знаходить імена контактів, яким належить телефон або електронна адреса, у порядку книги."""
+        if '@' in value:
+            return self.data.select_keys(
+                'WHERE name IN (SELECT name FROM emails WHERE email = ?) ORDER BY id',
+                (value.lower(),),
+            )
+        return self.data.select_keys(
+            'WHERE name IN (SELECT name FROM phones WHERE phone = ?) ORDER BY id',
+            (normalize_phone(value),),
+        )
+
+    def _find_by_birthday(self, month, day):
+        """Отримує імена контактів з днем народження у вказаний день у порядку книги."""
+        return self.data.select_keys('WHERE birth_month = ? AND birth_day = ? ORDER BY id', (month, day))
+
+    def _index_record(self, record):
+        """Записує змінений запис до бази даних."""
+        self.data[record.name.value] = record
+
+    def _unindex_record(self, record):
+        pass
+
+
+class SqliteNotesBook(NotesBook):
+    """
+    Клас SqliteNotesBook визначає книгу нотаток, що зберігається у базі даних SQLite.
+
+    Пошук за заголовком та тегами виконується запитами до бази даних.
+
+    """
+
+    def __init__(self, connection):
+        super().__init__()
+        self.connection = connection
+        self.data = SqliteNotes(connection, self)
+
+    def __setitem__(self, title, note):
+        note._book = self
+        self.data[title] = note
+
+    def __delitem__(self, title):
+        del self.data[title]
+
+    def values(self):
+        return self.data.values()
+
+    def items(self):
+        return self.data.items()
+
+    def pop_changes(self):
+        """Повертає порожній список: зміни одразу записуються до бази даних."""
+        return []
+
+    def find_note_by_title(self, title: str):
+        """Пошук нотатки за заголовком."""
+        return self.data.get(title)
+
+    def find_notes_by_tags(self, tags: list, match_all=False) -> list:
+        """Пошук нотаток з будь-яким тегом зі списку або, якщо match_all, з усіма тегами."""
+        cleaned_tags = set(tag.strip('\'"') for tag in tags)
+        placeholders = ', '.join('?' for _ in cleaned_tags)
+        having = f'HAVING COUNT(DISTINCT tag) = {len(cleaned_tags)}' if match_all else ''
+        return self.data.select(
+            f'WHERE title IN (SELECT title FROM tags WHERE tag IN ({placeholders}) GROUP BY title {having}) ORDER BY id',
+            list(cleaned_tags),
+        )
+
+    def search_notes(self, query: str, limit=20) -> list:
+        """Повнотекстовий пошук нотаток за заголовком та описом, найрелевантніші першими."""
+        terms = words(query)
+        if not terms:
+            return []
+        # every word is also matched as a prefix
+        match = ' OR '.join(f'"{term}"*' for term in terms)
+        return self.data.select(
+            'JOIN notes_text ON notes_text.rowid = notes.id WHERE notes_text MATCH ? ORDER BY bm25(notes_text) LIMIT ?',
+            (match, limit),
+        )
+
+    def _index_record(self, note):
+        """Записує змінену нотатку до бази даних."""
+        self.data[note.title.value] = note
+
+
+def open_sqlite_books(path=DATABASE_FILE):
+    """
+    Відкриває базу даних SQLite і повертає книги, що в ній зберігаються.
+
+    Args:
+        path (str): Шлях до файлу бази даних.
+
+    Returns:
+        tuple: Кортеж, що містить екземпляри SqliteAddressBook та SqliteNotesBook.
+    """
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    if 'name_key' not in [row[1] for row in connection.execute('PRAGMA table_info(contacts)')]:
+        # databases created before the name key was stored
+        connection.execute('ALTER TABLE contacts ADD COLUMN name_key TEXT')
+        connection.executemany(
+            'UPDATE contacts SET name_key = ? WHERE name = ?',
+            [(name_key(row[0]), row[0]) for row in connection.execute('SELECT name FROM contacts')],
+        )
+        connection.execute('DROP INDEX IF EXISTS contacts_name_lower')
+        connection.commit()
+    connection.execute(NAME_KEY_INDEX)
+    notes_book = SqliteNotesBook(connection)
+    if connection.execute('SELECT COUNT(*) FROM notes_text').fetchone()[0] == 0:
+        # databases created before full-text search have notes without text rows
+        for title, note in notes_book.data.items():
+            notes_book.data[title] = note
+        connection.commit()
+    return SqliteAddressBook(connection), notes_book
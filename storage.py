@@ -0,0 +1,269 @@
+import io
+import os
+import pickle
+import struct
+import threading
+from contextlib import contextmanager
+from address_book import AddressBook
+from indexed_storage import IndexedAddressBook, fsync_directory, is_indexed_file, recover_records, write_indexed
+from notes_book import NotesBook
+
+
+# errors of a damaged snapshot; other errors, such as OSError, are raised as they are
+DAMAGE_ERRORS = (pickle.UnpicklingError, EOFError, ValueError, struct.error)
+
+ADDRESS_BOOK_FILE = 'address_book.pkl'
+NOTES_BOOK_FILE = 'notes_book.pkl'
+NOTES_INDEX_FILE = 'notes_index.pkl'
+JOURNAL_FILE = 'journal.pkl'
+
+
+def read_snapshot(problems=None):
+    """
+    Читає знімки адресної книги та книги нотаток з файлів.
+
+    Адресна книга у форматі з індексом відображається у пам'ять без декодування записів,
+    знімки старого формату завантажуються через pickle. Повнотекстовий індекс нотаток
+    використовується, якщо він збережений разом з тим самим знімком книги нотаток.
+
+    Відсутній знімок замінюється порожньою книгою. Пошкоджений знімок переноситься у файл
+    '<знімок>.corrupt', а з адресної книги відновлюються всі записи до місця пошкодження.
+
+    Args:
+        problems (list): Список, до якого додаються повідомлення про пошкоджені файли.
+
+    Returns:
+        tuple: Кортеж, що містить екземпляри AddressBook та NotesBook.
+
+    Raises:
+        OSError: Якщо знімок не вдається прочитати; такий знімок не вважається пошкодженим.
+    """
+    if problems is None:
+        problems = []
+    address_book = _read_or_recover(ADDRESS_BOOK_FILE, _load_address_book, _recover_address_book, problems)
+    notes_book = _read_or_recover(NOTES_BOOK_FILE, _load_pickle, lambda path: NotesBook(), problems)
+    try:
+        with open(NOTES_INDEX_FILE, 'rb') as f:
+            notes_book.attach_text_index(pickle.load(f))
+    except FileNotFoundError:
+        pass
+    except Exception:
+        # the index is rebuilt from the notes on first search
+        pass
+    return address_book, notes_book
+
+
+def _read_or_recover(path, load, recover, problems):
+    """Завантажує знімок, а якщо він пошкоджений, відкладає його та відновлює книгу."""
+    try:
+        return load(path)
+    except FileNotFoundError:
+        return recover(None)
+    except DAMAGE_ERRORS as e:
+        corrupt_path = f'{path}.corrupt'
+        os.replace(path, corrupt_path)
+        book = recover(corrupt_path)
+        problems.append(
+            f"{path} is damaged ({type(e).__name__}: {e}); it was moved to {corrupt_path} "
+            f"and {len(book)} record(s) were recovered."
+        )
+        return book
+
+
+def _load_address_book(path):
+    """Завантажує адресну книгу у форматі з індексом або через pickle."""
+    if is_indexed_file(path):
+        return IndexedAddressBook(path)
+    return _load_pickle(path)
+
+
+def _load_pickle(path):
+    """Завантажує об'єкт з файлу pickle."""
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def _recover_address_book(path):
+    """Відновлює записи пошкодженого знімку адресної книги у форматі з індексом."""
+    book = AddressBook()
+    if path is not None and is_indexed_file(path):
+        for record in recover_records(path):
+            book.add_record(record)
+    return book
+
+
+def write_snapshot(address_book, notes_book):
+    """
+    Записує повні знімки адресної книги та книги нотаток у файли.
+
+    Адресна книга записується у форматі з індексом, а поруч з книгою нотаток
+    зберігається її повнотекстовий індекс з тим самим ідентифікатором знімку.
+    Кожен файл спочатку повністю записується на диск у тимчасовий файл і лише потім
+    заміняє попередній, тому збій не залишає обрізаного знімку.
+
+    Args:
+        address_book (AddressBook): Екземпляр класу AddressBook.
+        notes_book (NotesBook): Екземпляр класу NotesBook.
+    """
+    write_indexed(ADDRESS_BOOK_FILE, address_book)
+
+    notes_book.generation = os.urandom(16).hex()
+    text_index = notes_book.get_text_index()
+    text_index.generation = notes_book.generation
+    for path, value in [(NOTES_INDEX_FILE, text_index), (NOTES_BOOK_FILE, notes_book)]:
+        with open(f'{path}.tmp', 'wb') as f:
+            pickle.dump(value, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f'{path}.tmp', path)
+    fsync_directory(NOTES_BOOK_FILE)
+
+
+class Journal:
+    """
+    Клас Journal визначає журнал змін, що дописується поверх останнього знімку.
+
+    Кожен запис журналу містить усі контакти та нотатки, змінені однією командою.
+    Коли кількість записів досягає compact_threshold, журнал стискається у новий знімок.
+
+    Атрибути:
+        path (str): Шлях до файлу журналу.
+        compact_threshold (int): Кількість записів, після якої журнал стискається.
+        entries (int): Кількість записів у журналі.
+
+    """
+
+    def __init__(self, path=JOURNAL_FILE, compact_threshold=1000):
+        self.path = path
+        self.compact_threshold = compact_threshold
+        self.entries = 0
+
+    def append(self, address_book, notes_book):
+        """Дописує до журналу незбережені зміни обох книг."""
+        changes = [('contact', name, record) for name, record in address_book.pop_changes()]
+        changes += [('note', title, note) for title, note in notes_book.pop_changes()]
+        if not changes:
+            return
+
+        self._write(changes)
+        self.entries += 1
+
+        if self.entries >= self.compact_threshold:
+            self.compact(address_book, notes_book)
+
+    def replay(self, address_book, notes_book):
+        """Застосовує записи журналу до книг, завантажених з останнього знімку."""
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        stream = io.BytesIO(data)
+        self.entries = 0
+        while stream.tell() < len(data):
+            offset = stream.tell()
+            try:
+                changes = pickle.load(stream)
+            except Exception:
+                # the last entry was cut short by a crash, drop it
+                with open(self.path, 'r+b') as f:
+                    f.truncate(offset)
+                break
+
+            apply_changes(changes, address_book, notes_book)
+            self.entries += 1
+
+        # replayed changes are already on disk
+        address_book.pop_changes()
+        notes_book.pop_changes()
+
+    def compact(self, address_book, notes_book):
+        """Записує новий знімок книг та очищує журнал."""
+        address_book.pop_changes()
+        notes_book.pop_changes()
+        write_snapshot(address_book, notes_book)
+        with open(self.path, 'wb'):
+            pass
+        self.entries = 0
+
+    @contextmanager
+    def synchronized(self, address_book, notes_book, write=False):
+        """
+        Готує книги до виконання команди.
+
+        Журнал одного сеансу не змінюється іншими процесами, тому синхронізувати нічого не потрібно.
+
+        Args:
+            address_book (AddressBook): Екземпляр класу AddressBook.
+            notes_book (NotesBook): Екземпляр класу NotesBook.
+            write (bool): Чи змінює команда книги.
+        """
+        yield
+
+    def _write(self, changes):
+        """Дописує один запис до файлу журналу і чекає, доки він потрапить на диск."""
+        with open(self.path, 'ab') as f:
+            pickle.dump(changes, f)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def apply_changes(changes, address_book, notes_book):
+    """Застосовує до книг зміни одного запису журналу."""
+    for kind, key, value in changes:
+        book = address_book if kind == 'contact' else notes_book
+        if value is not None:
+            book[key] = value
+        elif key in book.data:
+            del book[key]
+
+
+class Autosaver(threading.Thread):
+    """
+    Клас Autosaver визначає фоновий потік, що записує знімки змінених книг.
+
+    Кожна команда вже дописує свої зміни до журналу, тож потік раз на interval секунд,
+    якщо книги змінювалися, стискає журнал у новий знімок поза циклом введення команд.
+    Команди та запис знімку не виконуються одночасно завдяки спільному замку lock.
+
+    Атрибути:
+        journal (Journal): Журнал змін, який стискається.
+        address_book (AddressBook): Екземпляр класу AddressBook.
+        notes_book (NotesBook): Екземпляр класу NotesBook.
+        interval (float): Інтервал між перевірками у секундах.
+        lock (threading.Lock): Замок, який тримають команди, що працюють з книгами.
+
+    """
+
+    def __init__(self, journal, address_book, notes_book, interval=60):
+        super().__init__(name='autosave', daemon=True)
+        self.journal = journal
+        self.address_book = address_book
+        self.notes_book = notes_book
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.dirty = threading.Event()
+        self.stopped = threading.Event()
+
+    def mark_dirty(self):
+        """Позначає, що книги змінилися з часу останнього знімку."""
+        self.dirty.set()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.save()
+
+    def save(self):
+        """Записує знімок, якщо книги змінилися."""
+        if not self.dirty.is_set():
+            return
+        with self.lock:
+            self.dirty.clear()
+            self.journal.compact(self.address_book, self.notes_book)
+
+    def stop(self):
+        """Зупиняє потік, дочекавшись завершення поточного запису."""
+        self.stopped.set()
+        if self.is_alive():
+            self.join()